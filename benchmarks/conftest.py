@@ -0,0 +1,14 @@
+from __future__ import annotations
+
+import os
+
+import pytest
+
+# Rows created per benchmark; override with the BENCHMARK_ROWS environment
+# variable to measure bigger tables.
+BENCHMARK_ROWS = int(os.environ.get('BENCHMARK_ROWS', 2000))
+
+
+@pytest.fixture(scope='session')
+def rows() -> int:
+    return BENCHMARK_ROWS
@@ -0,0 +1,99 @@
+"""
+Synthetic multi-table inheritance hierarchies for the benchmarks.
+
+The models are built at runtime in an isolated app registry, so any number
+of shapes can be measured without adding models to the test app, and their
+tables are created and dropped by the fixtures that use them.
+"""
+from __future__ import annotations
+
+from typing import Any, NamedTuple, cast
+
+from django.apps.registry import Apps
+from django.db import models
+
+from model_utils.managers import InheritanceManager
+
+
+class Hierarchy(NamedTuple):
+    # Root first, then level by level.
+    all_models: list[type[models.Model]]
+    depth: int
+    width: int
+
+    @property
+    def root(self) -> type[models.Model]:
+        return self.all_models[0]
+
+    @property
+    def manager(self) -> InheritanceManager[Any]:
+        return cast('InheritanceManager[Any]', self.root._default_manager)
+
+    @property
+    def leaves(self) -> list[type[models.Model]]:
+        return [
+            model for model in self.all_models
+            if len(model._meta.get_parent_list()) == self.depth
+        ]
+
+
+def parse_shapes(value: str) -> list[tuple[int, int]]:
+    """
+    Parse comma separated ``DEPTHxWIDTH`` shapes, such as ``'1x8,3x2'``.
+    """
+    shapes = []
+    for shape in value.split(','):
+        depth, width = shape.strip().lower().split('x')
+        shapes.append((int(depth), int(width)))
+    return shapes
+
+
+def build_hierarchy(depth: int, width: int) -> Hierarchy:
+    """
+    Build a hierarchy in which each model below ``depth`` levels of
+    inheritance has ``width`` direct subclasses, each adding a field.
+    """
+    # Reverse relations, and so subclasses, are only discovered among the
+    # models of installed apps.
+    apps = Apps(['benchmarks'])
+    prefix = f'Depth{depth}Width{width}'
+
+    def make_model(
+        name: str, base: type[models.Model], attrs: dict[str, Any]
+    ) -> type[models.Model]:
+        meta = type('Meta', (), {'app_label': 'benchmarks', 'apps': apps})
+        return type(prefix + name, (base,), {
+            '__module__': __name__, 'Meta': meta, **attrs,
+        })
+
+    root = make_model('Node', models.Model, {
+        'name': models.CharField(max_length=50, default=''),
+        'objects': InheritanceManager(),
+    })
+    all_models = [root]
+    level = [root]
+    for depth_index in range(1, depth + 1):
+        next_level = []
+        for parent in level:
+            for width_index in range(width):
+                next_level.append(make_model(
+                    f'{parent.__name__[len(prefix):]}{width_index}',
+                    parent,
+                    {f'value{depth_index}': models.IntegerField(default=width_index)},
+                ))
+        all_models.extend(next_level)
+        level = next_level
+    return Hierarchy(all_models, depth, width)
+
+
+def populate(hierarchy: Hierarchy, rows: int, batch_size: int = 1000) -> None:
+    """
+    Create ``rows`` objects spread evenly over all models of the hierarchy.
+    """
+    per_model, remainder = divmod(rows, len(hierarchy.all_models))
+    for index, model in enumerate(hierarchy.all_models):
+        objs = [model() for _ in range(per_model + (index < remainder))]
+        if model is hierarchy.root:
+            model._base_manager.bulk_create(objs, batch_size=batch_size)
+        else:
+            hierarchy.manager.bulk_create_subclass(objs, batch_size=batch_size)
@@ -0,0 +1,76 @@
+"""
+Row throughput of iterating ``select_subclasses()`` querysets.
+
+These measure the per-row work done by ``InheritanceIterable`` on top of
+Django's own model instantiation, so regressions in subclass resolution
+or in copying annotations onto resolved instances show up here.
+"""
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+from django.db import models
+
+from tests.models import (
+    InheritanceManagerTestChild1,
+    InheritanceManagerTestChild2,
+    InheritanceManagerTestGrandChild1,
+    InheritanceManagerTestParent,
+)
+
+pytestmark = pytest.mark.django_db
+
+
+def _create(model: type[models.Model], rows: int) -> None:
+    for _ in range(rows):
+        model.objects.create()
+
+
+def test_iterate_parents(benchmark: Any, rows: int) -> None:
+    _create(InheritanceManagerTestParent, rows)
+    qs = InheritanceManagerTestParent.objects.select_subclasses()
+    result = benchmark(lambda: list(qs.all()))
+    assert len(result) == rows
+
+
+def test_iterate_parents_annotated(benchmark: Any, rows: int) -> None:
+    """Unresolved rows need no copying of annotations or extras."""
+    _create(InheritanceManagerTestParent, rows)
+    qs = InheritanceManagerTestParent.objects.select_subclasses().annotate(
+        models.Count('related'), doubled=models.F('id') * 2,
+    ).extra(select={'incremented': 'id + 1'})
+    result = benchmark(lambda: list(qs.all()))
+    assert len(result) == rows
+
+
+def test_iterate_children_annotated(benchmark: Any, rows: int) -> None:
+    _create(InheritanceManagerTestChild1, rows // 2)
+    _create(InheritanceManagerTestGrandChild1, rows // 2)
+    qs = InheritanceManagerTestParent.objects.select_subclasses().annotate(
+        models.Count('related'), doubled=models.F('id') * 2,
+    ).extra(select={'incremented': 'id + 1'})
+    result = benchmark(lambda: list(qs.all()))
+    assert all(obj.doubled == obj.pk * 2 for obj in result)
+
+
+def test_iterator_children(benchmark: Any, rows: int) -> None:
+    _create(InheritanceManagerTestChild1, rows // 2)
+    _create(InheritanceManagerTestGrandChild1, rows // 2)
+    qs = InheritanceManagerTestParent.objects.select_subclasses()
+    count = benchmark(lambda: sum(1 for _ in qs.iterator(chunk_size=500)))
+    assert count == rows
+
+
+@pytest.mark.parametrize('strategy', ['join', 'union'])
+def test_iterate_leaves_by_strategy(benchmark: Any, rows: int, strategy: str) -> None:
+    """
+    Compare the single LEFT JOIN query with the UNION ALL of per-subclass
+    queries, for rows that each belong to one leaf subclass.
+    """
+    _create(InheritanceManagerTestChild2, rows // 2)
+    _create(InheritanceManagerTestGrandChild1, rows // 2)
+    qs = InheritanceManagerTestParent.objects.select_subclasses(
+        strategy=strategy).order_by('pk')
+    result = benchmark(lambda: list(qs.all()))
+    assert len(result) == rows
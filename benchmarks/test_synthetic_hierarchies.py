@@ -0,0 +1,96 @@
+"""
+Inheritance queries on synthetic hierarchies of configurable shape.
+
+Each shape is given as ``DEPTHxWIDTH`` in the comma separated
+``BENCHMARK_HIERARCHIES`` environment variable; the default covers a wide,
+a balanced and a deep hierarchy. ``BENCHMARK_ROWS`` objects are spread over
+all models of each hierarchy. Besides the timings, ``extra_info`` records
+the number of joins of each query and the peak memory allocated while
+evaluating it once under ``tracemalloc``.
+"""
+from __future__ import annotations
+
+import os
+import tracemalloc
+from typing import Any, Callable, Iterator
+
+import pytest
+from django.db import connection
+from django.db.models import QuerySet
+
+from benchmarks.hierarchy import (
+    Hierarchy,
+    build_hierarchy,
+    parse_shapes,
+    populate,
+)
+
+SHAPES = parse_shapes(os.environ.get('BENCHMARK_HIERARCHIES', '1x8,3x2,8x1'))
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(scope='module', params=SHAPES, ids=lambda shape: '{}x{}'.format(*shape))
+def hierarchy(
+    request: pytest.FixtureRequest, django_db_setup: None, django_db_blocker: Any, rows: int
+) -> Iterator[Hierarchy]:
+    hierarchy = build_hierarchy(*request.param)
+    with django_db_blocker.unblock():
+        with connection.schema_editor() as editor:
+            for model in hierarchy.all_models:
+                editor.create_model(model)
+        populate(hierarchy, rows)
+        yield hierarchy
+        with connection.schema_editor() as editor:
+            for model in reversed(hierarchy.all_models):
+                editor.delete_model(model)
+
+
+def _record(benchmark: Any, qs: QuerySet[Any], evaluate: Callable[[], object]) -> None:
+    benchmark.extra_info['joins'] = str(qs.query).count(' JOIN ')
+    tracemalloc.start()
+    try:
+        evaluate()
+        benchmark.extra_info['peak_memory_kib'] = tracemalloc.get_traced_memory()[1] // 1024
+    finally:
+        tracemalloc.stop()
+
+
+def test_select_subclasses(benchmark: Any, hierarchy: Hierarchy, rows: int) -> None:
+    qs = hierarchy.manager.select_subclasses()
+    _record(benchmark, qs, lambda: list(qs.all()))
+    result = benchmark(lambda: list(qs.all()))
+    assert len(result) == rows
+
+
+def test_select_subclasses_leaves(benchmark: Any, hierarchy: Hierarchy) -> None:
+    qs = hierarchy.manager.select_subclasses(leaves_only=True)
+    _record(benchmark, qs, lambda: list(qs.all()))
+    benchmark(lambda: list(qs.all()))
+
+
+def test_iterator(benchmark: Any, hierarchy: Hierarchy, rows: int) -> None:
+    qs = hierarchy.manager.select_subclasses()
+
+    def consume() -> int:
+        return sum(1 for _ in qs.iterator(chunk_size=2000))
+
+    _record(benchmark, qs, consume)
+    assert benchmark(consume) == rows
+
+
+def test_get_subclass(benchmark: Any, hierarchy: Hierarchy) -> None:
+    leaf = hierarchy.leaves[-1]
+    pk = leaf._base_manager.values_list('pk', flat=True).first()
+    manager = hierarchy.manager
+    qs = manager.select_subclasses().filter(pk=pk)
+    _record(benchmark, qs, lambda: manager.get_subclass(pk=pk))
+    assert type(benchmark(lambda: manager.get_subclass(pk=pk))) is leaf
+
+
+def test_instance_of(benchmark: Any, hierarchy: Hierarchy) -> None:
+    subclass = hierarchy.all_models[1]
+    qs = hierarchy.manager.instance_of(subclass)
+    _record(benchmark, qs, lambda: list(qs.all()))
+    result = benchmark(lambda: list(qs.all()))
+    assert all(isinstance(obj, subclass) for obj in result)
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Mapping, Protocol
+
+
+class CacheBackend(Protocol):
+    """
+    The subset of Django's cache API used by django-model-utils, so that
+    either an ``LRUCache`` or one of ``django.core.cache.caches`` can be
+    used where a cache is accepted.
+    """
+
+    def get(self, key: str, default: Any = None) -> Any:
+        ...
+
+    def set_many(self, data: dict[str, Any], timeout: float | None = ...) -> Any:
+        ...
+
+    def delete(self, key: str) -> Any:
+        ...
+
+
+class LRUCache:
+    """
+    A bounded, process-local cache discarding the least recently used
+    entries once it holds more than ``maxsize`` of them, and entries set with
+    a ``timeout`` once it has passed. Safe to share between threads.
+    """
+
+    def __init__(self, maxsize: int = 10000):
+        if maxsize <= 0:
+            raise ValueError('maxsize must be a positive integer.')
+        self.maxsize = maxsize
+        # the values, with the monotonic time they expire at
+        self._data: OrderedDict[str, tuple[Any, float | None]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> dict[str, Any]:
+        # Querysets referring to the cache may be pickled; the entries and
+        # the lock aren't.
+        return {'maxsize': self.maxsize}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__init__(**state)  # type: ignore[misc]
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            try:
+                value, expires = self._data[key]
+            except KeyError:
+                return default
+            if expires is not None and expires <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, timeout: float | None = None) -> None:
+        self.set_many({key: value}, timeout)
+
+    def set_many(self, data: Mapping[str, Any], timeout: float | None = None) -> None:
+        expires = None if timeout is None else time.monotonic() + timeout
+        with self._lock:
+            for key, value in data.items():
+                self._data[key] = (value, expires)
+                self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
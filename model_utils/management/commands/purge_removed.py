@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import datetime
+from typing import Any
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import DEFAULT_DB_ALIAS, models
+
+from model_utils.managers import purge_removed
+
+
+def _get_model(label: str) -> type[models.Model]:
+    try:
+        return apps.get_model(label)
+    except (LookupError, ValueError) as e:
+        raise CommandError(str(e))
+
+
+class Command(BaseCommand):
+    help = (
+        'Delete the objects of a SoftDeletableModel marked as removed, in batches '
+        'ordered by primary key. Prints the largest primary key purged after each '
+        'batch, which can be passed to --start-after to resume.'
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument('model', help='The model to purge, as app_label.ModelName.')
+        parser.add_argument(
+            '--older-than-days', type=float,
+            help='Only purge objects whose --date-field is older than this many days.')
+        parser.add_argument(
+            '--date-field',
+            help='The date field --older-than-days applies to, removed_at by default.')
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument(
+            '--sleep', type=float, default=0, help='Seconds to wait between batches.')
+        parser.add_argument(
+            '--archive-to', help='A model, as app_label.ModelName, to copy the objects into.')
+        parser.add_argument('--start-after', help='The primary key to resume after.')
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        model = _get_model(options['model'])
+        if not any(field.name == 'is_removed' for field in model._meta.fields):
+            raise CommandError(f'{model._meta.label} is not a SoftDeletableModel.')
+        older_than = None
+        if options['older_than_days'] is not None:
+            older_than = datetime.timedelta(days=options['older_than_days'])
+        archive_to = None
+        if options['archive_to'] is not None:
+            archive_to = _get_model(options['archive_to'])
+
+        def progress(purged: int, last_pk: Any) -> None:
+            self.stdout.write(f'Purged {purged} objects, up to primary key {last_pk}.')
+
+        try:
+            total, counts = purge_removed(
+                model._base_manager.using(options['database']),
+                older_than=older_than,
+                date_field=options['date_field'],
+                batch_size=options['batch_size'],
+                sleep=options['sleep'],
+                archive_to=archive_to,
+                start_after=options['start_after'],
+                progress=progress if options['verbosity'] > 0 else None,
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+        if options['verbosity'] > 0:
+            self.stdout.write(self.style.SUCCESS(
+                'Deleted {} objects: {}.'.format(
+                    total, ', '.join(f'{label}: {n}' for label, n in sorted(counts.items())))
+            ))
@@ -1,22 +1,64 @@
 from __future__ import annotations
 
+import base64
+import concurrent.futures
+import copy
+import datetime
+import json
+import operator
+import threading
+import time
+import uuid
 import warnings
-from collections.abc import Iterable
+import weakref
+from collections import Counter, defaultdict
+from collections.abc import Iterable, Mapping
+from contextlib import ContextDecorator
+from contextvars import ContextVar, Token
+from functools import partial, reduce
+from itertools import islice
 from typing import TYPE_CHECKING, Any, Generic, Sequence, TypeVar, cast, overload
 
-from django.core.exceptions import ObjectDoesNotExist
-from django.db import connection, models
+from asgiref.sync import sync_to_async
+from django.apps import apps
+from django.core.exceptions import (
+    FieldDoesNotExist,
+    ObjectDoesNotExist,
+    ValidationError,
+)
+from django.core.serializers.json import DjangoJSONEncoder
+from django.core.signals import request_finished
+from django.db import NotSupportedError, connections, models, router, transaction
+from django.db.backends.utils import (  # type: ignore[attr-defined]
+    names_digest,
+)
+from django.db.models import Exists, OuterRef, Q
 from django.db.models.constants import LOOKUP_SEP
-from django.db.models.fields.related import OneToOneField, OneToOneRel
-from django.db.models.query import ModelIterable, QuerySet
+from django.db.models.deletion import Collector, get_candidate_relations_to_delete
+from django.db.models.fields.related import ForeignObjectRel, OneToOneField, OneToOneRel
+from django.db.models.functions import Cast
+from django.db.models.query import (
+    BaseIterable,
+    ModelIterable,
+    Prefetch,
+    QuerySet,
+    prefetch_related_objects,
+)
 from django.db.models.sql.datastructures import Join
+from django.utils import timezone
+
+from model_utils.cache import LRUCache
+from model_utils.tracker import FieldTracker
 
 ModelT = TypeVar('ModelT', bound=models.Model, covariant=True)
+T = TypeVar('T')
 
 if TYPE_CHECKING:
-    from collections.abc import Iterator
+    from collections.abc import AsyncIterator, Callable, Iterator
+
+    from django.db.backends.base.base import BaseDatabaseWrapper
 
-    from django.db.models.query import BaseIterable
+    from model_utils.cache import CacheBackend
 
 
 def _iter_inheritance_queryset(
@@ -24,10 +66,16 @@ def _iter_inheritance_queryset(
 ) -> Iterator[ModelT]:
     if hasattr(queryset, 'subclasses'):
         assert hasattr(queryset, '_get_sub_obj_recurse')
-        extras = tuple(queryset.query.extra.keys())
-        # sort the subclass names longest first,
+        # annotations and extra columns are only set on the parent object,
+        # so they need copying onto the subclass instance; work out which
+        # once rather than per row
+        copied_attrs = (
+            tuple(getattr(queryset, '_annotated', ()))
+            + tuple(queryset.query.extra)
+        )
+        # select_subclasses() sorts the subclass names longest first,
         # so with 'a' and 'a__b' it goes as deep as possible
-        subclasses = sorted(queryset.subclasses, key=len, reverse=True)
+        subclasses = queryset.subclasses
         for obj in iter:
             sub_obj = None
             for s in subclasses:
@@ -35,13 +83,10 @@ def _iter_inheritance_queryset(
                 if sub_obj:
                     break
             if not sub_obj:
-                sub_obj = obj
+                yield obj
+                continue
 
-            if hasattr(queryset, '_annotated'):
-                for k in queryset._annotated:
-                    setattr(sub_obj, k, getattr(obj, k))
-
-            for k in extras:
+            for k in copied_attrs:
                 setattr(sub_obj, k, getattr(obj, k))
 
             yield sub_obj
@@ -59,10 +104,106 @@ if TYPE_CHECKING:
         def __iter__(self) -> Iterator[ModelT]:
             ...
 
+        def __aiter__(self) -> AsyncIterator[ModelT]:
+            ...
+
 else:
     class InheritanceIterable(ModelIterable):
         def __iter__(self):
-            return _iter_inheritance_queryset(super().__iter__(), self.queryset)
+            objs = _iter_inheritance_queryset(super().__iter__(), self.queryset)
+            if self._uses_subclass_cache():
+                objs = self.queryset._populate_subclass_cache(objs)
+            return objs
+
+        def _uses_subclass_cache(self):
+            return (
+                getattr(self.queryset, '_subclass_cache', None) is not None
+                and hasattr(self.queryset, 'subclasses')
+            )
+
+        async def _async_generator(self):
+            # Only fetching the rows needs a thread; the child instances are
+            # already attached to the parent instances by select_related(),
+            # so subclasses are resolved here without another thread hop.
+            queryset = self.queryset
+            sync_generator = super().__iter__()
+
+            def next_slice(gen):
+                return list(islice(gen, self.chunk_size))
+
+            while True:
+                chunk = await sync_to_async(next_slice)(sync_generator)
+                objs = list(_iter_inheritance_queryset(chunk, queryset))
+                if getattr(queryset, '_subclass_prefetch_lookups', None):
+                    await sync_to_async(queryset._prefetch_subclass_related_objects)(objs)
+                if self._uses_subclass_cache():
+                    await sync_to_async(list)(queryset._populate_subclass_cache(iter(objs)))
+                for obj in objs:
+                    yield obj
+                if len(chunk) < self.chunk_size:
+                    break
+
+
+if TYPE_CHECKING:
+    class InheritanceUnionIterable(BaseIterable[ModelT]):
+        queryset: QuerySet[ModelT]
+
+        def __init__(self, queryset: QuerySet[ModelT], *args: Any, **kwargs: Any):
+            ...
+
+        def __iter__(self) -> Iterator[ModelT]:
+            ...
+
+else:
+    class InheritanceUnionIterable(BaseIterable):
+        """
+        Iterable for select_subclasses(strategy='union'), instantiating each
+        row of the UNION ALL query as the model of the branch it came from.
+        """
+
+        def __iter__(self):
+            queryset = self.queryset
+            union, branches = queryset._get_subclass_union()
+            if self.chunked_fetch:
+                rows = union.iterator(chunk_size=self.chunk_size)
+            else:
+                rows = union
+            db = queryset.db
+            objs = (
+                model.from_db(db, field_names, [row[i] for i in positions])
+                for row in rows
+                for model, field_names, positions in (branches[row[0]],)
+            )
+            if getattr(queryset, '_subclass_cache', None) is not None:
+                objs = queryset._populate_subclass_cache(objs)
+            return objs
+
+
+# The identity map of the active InheritanceIdentityMap, if any, keyed by
+# (database alias, topmost concrete model, primary key).
+_identity_map: ContextVar[dict[tuple[str, type[models.Model], Any], models.Model] | None] = \
+    ContextVar('model_utils_identity_map', default=None)
+# The tokens to restore the identity maps entered in the current context
+# with, innermost last. They're kept per context rather than on the
+# InheritanceIdentityMap, whose instance may be shared by concurrent threads
+# or tasks when used as a decorator.
+_identity_map_tokens: ContextVar[tuple[Token[Any], ...]] = \
+    ContextVar('model_utils_identity_map_tokens', default=())
+
+
+def _get_root_model(model: type[models.Model]) -> type[models.Model]:
+    """
+    Return the topmost concrete model of the inheritance chain of ``model``,
+    whose primary key values are shared by all the models in the chain.
+    """
+    concrete_model = model._meta.concrete_model
+    assert concrete_model is not None
+    parents = concrete_model._meta.get_parent_list()
+    return parents[-1] if parents else concrete_model
+
+
+def _get_subclass_cache_key(db: str, model: type[models.Model], pk: Any) -> str:
+    return f'model_utils:subclass:{db}:{_get_root_model(model)._meta.label_lower}:{pk}'
 
 
 class InheritanceQuerySetMixin(Generic[ModelT]):
@@ -70,11 +211,40 @@ class InheritanceQuerySetMixin(Generic[ModelT]):
     model: type[ModelT]
     subclasses: Sequence[str]
 
+    # Attributes carried over when the queryset is cloned.
+    _inheritance_attrs = (
+        'subclasses', '_annotated', '_subclass_prefetch_lookups', '_subclass_cache',
+        '_instance_of_models',
+    )
+
     def __init__(self, *args: object, **kwargs: object):
         super().__init__(*args, **kwargs)
         self._iterable_class: type[BaseIterable[ModelT]] = InheritanceIterable
+        self._subclass_prefetch_lookups: dict[type[models.Model], tuple[str | Prefetch, ...]] = {}
+        self._subclass_prefetch_done = False
+        # maps primary keys to the labels of their concrete subclasses
+        self._subclass_cache: CacheBackend | None = None
+        # the models passed to instance_of()
+        self._instance_of_models: tuple[type[models.Model], ...] = ()
+        # the queryset filtered on and the primary keys, when it's a
+        # pk__in lookup that can be served by the identity map
+        self._identity_map_lookup: tuple[InheritanceQuerySetMixin[ModelT], list[Any]] | None = None
 
-    def select_subclasses(self, *subclasses: str | type[models.Model]) -> InheritanceQuerySet[ModelT]:
+    def select_subclasses(
+        self,
+        *subclasses: str | type[models.Model],
+        fields: Mapping[type[models.Model], Iterable[str]] | None = None,
+        strategy: str = 'join',
+        max_depth: int | None = None,
+        leaves_only: bool = False,
+    ) -> InheritanceQuerySet[ModelT]:
+        if max_depth is not None and max_depth < 1:
+            raise ValueError('max_depth must be a positive integer.')
+        if strategy not in ('join', 'union'):
+            raise ValueError(
+                f"Unknown strategy {strategy!r}, expected 'join' or 'union'.")
+        if strategy == 'union' and fields:
+            raise ValueError("fields can't be used with strategy='union'.")
         model: type[ModelT] = self.model
         calculated_subclasses = self._get_subclasses_recurse(model)
         # if none were passed in, we can just short circuit and select all
@@ -101,15 +271,67 @@ class InheritanceQuerySetMixin(Generic[ModelT]):
                     )
             selected_subclasses = verified_subclasses
 
-        new_qs = cast('InheritanceQuerySet[ModelT]', self)
-        if selected_subclasses:
-            new_qs = new_qs.select_related(*selected_subclasses)
+        if max_depth is not None:
+            selected_subclasses = [
+                subclass for subclass in selected_subclasses
+                if subclass.count(LOOKUP_SEP) < max_depth
+            ]
+        if leaves_only:
+            selected_subclasses = [
+                subclass for subclass in selected_subclasses
+                if not any(
+                    other.startswith(subclass + LOOKUP_SEP)
+                    for other in calculated_subclasses
+                )
+            ]
+        # sort the subclass names longest first, so that subclasses are
+        # resolved as deep as possible without sorting on every iteration
+        selected_subclasses.sort(key=len, reverse=True)
+
+        new_qs = cast('InheritanceQuerySet[ModelT]', self)._chain()
+        if strategy == 'union':
+            # each branch of the union joins its own tables
+            new_qs._iterable_class = InheritanceUnionIterable
+        else:
+            new_qs._iterable_class = InheritanceIterable
+            if selected_subclasses:
+                new_qs = new_qs.select_related(*selected_subclasses)
+        if fields:
+            new_qs = new_qs.defer(
+                *self._get_subclass_deferred_fields(fields, selected_subclasses))
         new_qs.subclasses = selected_subclasses
         return new_qs
 
+    def _get_subclass_deferred_fields(
+        self,
+        fields: Mapping[type[models.Model], Iterable[str]],
+        selected_subclasses: Sequence[str],
+    ) -> list[str]:
+        """
+        Translate a mapping of subclass to the names of the fields to load
+        into the paths of the other fields stored in that subclass's table,
+        suitable for defer().
+        """
+        deferred: list[str] = []
+        for subclass, names in fields.items():
+            path = self._get_ancestors_path(subclass)
+            if path not in selected_subclasses:
+                raise ValueError(
+                    f"{subclass!r} is not among the selected subclasses")
+            names = set(names)
+            for name in names:
+                # Raises FieldDoesNotExist for unknown names.
+                subclass._meta.get_field(name)
+            deferred.extend(
+                path + LOOKUP_SEP + field.name
+                for field in subclass._meta.local_fields
+                if field.concrete and not field.primary_key and field.name not in names
+            )
+        return deferred
+
     def _chain(self, **kwargs: object) -> InheritanceQuerySet[ModelT]:
         update = {}
-        for name in ['subclasses', '_annotated']:
+        for name in self._inheritance_attrs:
             if hasattr(self, name):
                 update[name] = getattr(self, name)
 
@@ -121,11 +343,193 @@ class InheritanceQuerySetMixin(Generic[ModelT]):
     def _clone(self) -> InheritanceQuerySet[ModelT]:
         # django-stubs doesn't include this private API.
         qs = super()._clone()  # type: ignore[misc]
-        for name in ['subclasses', '_annotated']:
+        for name in self._inheritance_attrs:
             if hasattr(self, name):
                 setattr(qs, name, getattr(self, name))
         return qs
 
+    def prefetch_subclass_related(
+        self,
+        lookups: Mapping[type[models.Model], Sequence[str | Prefetch]] | None,
+    ) -> InheritanceQuerySet[ModelT]:
+        """
+        Like prefetch_related(), but for relations that only exist on some
+        subclasses. ``lookups`` maps a subclass to the lookups to prefetch
+        on the results that are instances of it; each subclass gets its
+        own prefetch batch. Passing None clears the lookups.
+        """
+        clone = self._chain()
+        if lookups is None:
+            clone._subclass_prefetch_lookups = {}
+            return clone
+
+        merged = dict(self._subclass_prefetch_lookups)
+        for model, model_lookups in lookups.items():
+            if not issubclass(model, self.model):
+                raise ValueError(
+                    f"{model!r} is not a subclass of {self.model!r}")
+            merged[model] = merged.get(model, ()) + tuple(model_lookups)
+        clone._subclass_prefetch_lookups = merged
+        return clone
+
+    def _prefetch_subclass_related_objects(self, objs: Sequence[Any]) -> None:
+        for model, lookups in self._subclass_prefetch_lookups.items():
+            instances = [obj for obj in objs if isinstance(obj, model)]
+            if instances:
+                prefetch_related_objects(instances, *lookups)
+
+    def filter(self, *args: Any, **kwargs: Any) -> InheritanceQuerySet[ModelT]:
+        clone = cast('InheritanceQuerySet[ModelT]', cast(QuerySet[ModelT], super()).filter(*args, **kwargs))
+        if (
+            _identity_map.get() is not None
+            and not args
+            and set(kwargs) == {'pk__in'}
+            and isinstance(kwargs['pk__in'], (list, tuple, set, frozenset))
+            and self._can_use_identity_map(ordered=False, all_subclasses=True)
+        ):
+            clone._identity_map_lookup = (self, list(kwargs['pk__in']))
+        return clone
+
+    def _can_use_identity_map(self, ordered: bool = True, all_subclasses: bool = False) -> bool:
+        """
+        Return whether the results of this queryset only depend on the
+        primary keys looked up, so that instances cached by the identity map
+        can stand in for them.
+        """
+        queryset = cast(QuerySet[ModelT], self)
+        query = queryset.query
+        if (
+            query.has_filters()
+            or query.is_sliced
+            or query.deferred_loading != (frozenset(), True)
+            or query.annotations
+            or query.extra
+            or query.select_for_update
+            # django-stubs doesn't include these private APIs.
+            or queryset._fields is not None  # type: ignore[attr-defined]
+            or queryset._prefetch_related_lookups  # type: ignore[attr-defined]
+            or self._subclass_prefetch_lookups
+        ):
+            return False
+        if not ordered and (
+            query.order_by or (query.default_ordering and self.model._meta.ordering)
+        ):
+            return False
+        if all_subclasses and (
+            set(getattr(self, 'subclasses', ())) != set(self._get_subclasses_recurse(self.model))
+        ):
+            return False
+        return True
+
+    def _identity_map_key(self, pk: Any) -> tuple[str, type[models.Model], Any]:
+        return (cast(QuerySet[ModelT], self).db, _get_root_model(self.model), pk)
+
+    def _fetch_from_identity_map(
+        self,
+        identity_map: dict[tuple[str, type[models.Model], Any], models.Model],
+        queryset: InheritanceQuerySetMixin[ModelT],
+        pks: list[Any],
+    ) -> list[ModelT] | None:
+        """
+        Return the instances of ``queryset.filter(pk__in=pks)``, fetching only
+        those missing from the identity map, in the order of ``pks``.
+        """
+        pk_field = self.model._meta.pk
+        try:
+            pks = list(dict.fromkeys(pk_field.to_python(pk) for pk in pks))
+        except ValidationError:
+            return None
+
+        found: dict[Any, ModelT] = {}
+        missing = []
+        for pk in pks:
+            obj = identity_map.get(self._identity_map_key(pk))
+            if isinstance(obj, self.model):
+                found[pk] = obj
+            else:
+                missing.append(pk)
+        if missing:
+            missing_queryset = cast(QuerySet[ModelT], queryset._chain())
+            missing_queryset.query.add_q(models.Q(pk__in=missing))
+            for obj in missing_queryset:
+                identity_map[self._identity_map_key(obj.pk)] = obj
+                found[obj.pk] = obj
+        return [found[pk] for pk in pks if pk in found]
+
+    def _fetch_all(self) -> None:
+        identity_map = _identity_map.get()
+        queryset = cast(QuerySet[ModelT], self)
+        if (
+            identity_map is not None
+            and self._identity_map_lookup is not None
+            and queryset._result_cache is None
+        ):
+            queryset._result_cache = self._fetch_from_identity_map(
+                identity_map, *self._identity_map_lookup)
+        # django-stubs doesn't include this private API.
+        super()._fetch_all()  # type: ignore[misc]
+        if self._subclass_prefetch_lookups and not self._subclass_prefetch_done:
+            result_cache = cast(QuerySet[ModelT], self)._result_cache
+            assert result_cache is not None
+            self._prefetch_subclass_related_objects(result_cache)
+            self._subclass_prefetch_done = True
+
+    def __aiter__(self) -> AsyncIterator[ModelT]:
+        queryset = cast(QuerySet[ModelT], self)
+        if (
+            queryset._result_cache is not None
+            or self._identity_map_lookup is not None
+            # django-stubs doesn't include this private API.
+            or queryset._prefetch_related_lookups  # type: ignore[attr-defined]
+            or not issubclass(self._iterable_class, InheritanceIterable)
+        ):
+            return cast(QuerySet[ModelT], super()).__aiter__()
+        return self._aiter_and_cache()
+
+    async def _aiter_and_cache(self) -> AsyncIterator[ModelT]:
+        """
+        Stream the results chunk by chunk, resolving subclasses in the event
+        loop, and fill the result cache once they have all been fetched.
+        """
+        queryset = cast(QuerySet[ModelT], self)
+        results = []
+        async for obj in self._iterable_class(queryset):
+            results.append(obj)
+            yield obj
+        queryset._result_cache = results
+        self._subclass_prefetch_done = True
+
+    async def aget_subclass(self, *args: object, **kwargs: object) -> ModelT:
+        return await sync_to_async(self.get_subclass)(*args, **kwargs)
+
+    async def ainstance_of(self, *models: type[ModelT]) -> AsyncIterator[ModelT]:
+        """
+        Asynchronously iterate over the objects that are instances of the
+        provided model(s).
+        """
+        queryset = cast('InheritanceQuerySet[ModelT]', self).instance_of(*models)
+        async for obj in queryset:
+            yield obj
+
+    def iterator(self, chunk_size: int | None = None) -> Iterator[ModelT]:
+        if chunk_size is None and self._subclass_prefetch_lookups:
+            raise ValueError(
+                'chunk_size must be provided when using QuerySet.iterator() '
+                'after prefetch_subclass_related().'
+            )
+        return cast(QuerySet[ModelT], super()).iterator(chunk_size)
+
+    def _iterator(self, use_chunked_fetch: bool, chunk_size: int | None) -> Iterator[ModelT]:
+        # django-stubs doesn't include this private API.
+        iterator = super()._iterator(use_chunked_fetch, chunk_size)  # type: ignore[misc]
+        if not self._subclass_prefetch_lookups:
+            yield from iterator
+            return
+
+        while results := list(islice(iterator, chunk_size)):
+            self._prefetch_subclass_related_objects(results)
+            yield from results
+
     def annotate(self, *args: Any, **kwargs: Any) -> InheritanceQuerySet[ModelT]:
         qset = cast(QuerySet[ModelT], super()).annotate(*args, **kwargs)
         qset._annotated = [a.default_alias for a in args] + list(kwargs.keys())
@@ -180,6 +584,210 @@ class InheritanceQuerySetMixin(Generic[ModelT]):
 
         return LOOKUP_SEP.join(ancestry)
 
+    def _get_model_for_path(self, path: str) -> type[models.Model]:
+        """
+        Given a relation path as produced by _get_subclasses_recurse, return
+        the subclass that path leads to.
+        """
+        model: type[models.Model] = self.model
+        for rel in path.split(LOOKUP_SEP):
+            related_model = model._meta.get_field(rel).related_model
+            assert isinstance(related_model, type)
+            model = related_model
+        return model
+
+    def _get_subclass_label_case(self) -> tuple[models.Case, dict[str, type[models.Model]]]:
+        """
+        Build a CASE expression evaluating to the label of the most specific
+        selected subclass each row belongs to, checking the primary keys of
+        the joined child tables deepest first. Also return the models that
+        the expression can produce, keyed by label.
+        """
+        model: type[ModelT] = self.model
+        # select_subclasses() sorts the subclasses deepest first
+        subclasses = getattr(self, 'subclasses', None)
+        if subclasses is None:
+            subclasses = sorted(self._get_subclasses_recurse(model), key=len, reverse=True)
+
+        models_by_label: dict[str, type[models.Model]] = {model._meta.label: model}
+        whens = []
+        for subclass in subclasses:
+            subclass_model = self._get_model_for_path(subclass)
+            label = subclass_model._meta.label
+            models_by_label[label] = subclass_model
+            whens.append(models.When(
+                models.Q(**{subclass + LOOKUP_SEP + 'isnull': False}),
+                then=models.Value(label),
+            ))
+        case = models.Case(
+            *whens,
+            default=models.Value(model._meta.label),
+            output_field=models.CharField(),
+        )
+        return case, models_by_label
+
+    def with_subclass_label(self, name: str) -> InheritanceQuerySet[ModelT]:
+        """
+        Annotate each object with the label of its most specific subclass,
+        computed in SQL, so that values() and values_list() results tell
+        the types apart without instantiating the models.
+
+        Only the subclasses selected with select_subclasses() are labeled
+        (all of them if it wasn't called); other objects get the label of
+        the closest selected ancestor.
+        """
+        case, _ = self._get_subclass_label_case()
+        return self.annotate(**{name: case})
+
+    def subclass_counts(self) -> dict[type[models.Model], int]:
+        """
+        Return the number of objects in this queryset per subclass, using a
+        single aggregate query grouped on the joined child tables.
+
+        Only the subclasses selected with select_subclasses() are counted
+        separately (all of them if it wasn't called); other objects are
+        counted against the closest selected ancestor.
+        """
+        case, models_by_label = self._get_subclass_label_case()
+        rows = (
+            cast(QuerySet[ModelT], self)
+            .order_by()
+            .annotate(_subclass_label=case)
+            .values_list('_subclass_label')
+            .annotate(models.Count('pk'))
+        )
+        counts = dict.fromkeys(models_by_label.values(), 0)
+        for label, count in rows:
+            counts[models_by_label[label]] = count
+        return counts
+
+    def _get_subclass_union(
+        self,
+    ) -> tuple[QuerySet[Any, Any], list[tuple[type[models.Model], list[str], list[int]]]]:
+        """
+        Build the UNION ALL of one values_list() query per selected subclass,
+        each only joining the tables of that subclass and its ancestors, and
+        one for the rows of no selected subclass. The first column of each
+        row is the index of its branch.
+
+        Also return, per branch, the model to instantiate, the names of its
+        fields and the positions of their values in the rows.
+        """
+        queryset = cast(QuerySet[ModelT], self)
+        query = queryset.query
+        if (
+            query.deferred_loading != (frozenset(), True)
+            or query.annotations
+            or query.extra
+            or query.distinct
+            or query.select_related
+        ):
+            raise NotSupportedError(
+                "select_subclasses(strategy='union') doesn't support deferred "
+                "fields, annotations, extra(), distinct() or select_related()."
+            )
+
+        model = self.model
+        selected = list(self.subclasses)
+        # the columns: the branch index, the fields of the base model, then
+        # the local fields of the subclasses of each branch
+        columns: list[tuple[str, models.Field[Any, Any]]] = []
+        for field in model._meta.fields:
+            if field.concrete:
+                columns.append((field.attname, field))
+        subclass_columns: dict[str, list[int]] = {}
+        for path in selected:
+            for depth in range(1, path.count(LOOKUP_SEP) + 2):
+                prefix = LOOKUP_SEP.join(path.split(LOOKUP_SEP)[:depth])
+                if prefix not in subclass_columns:
+                    prefix_model = self._get_model_for_path(prefix)
+                    subclass_columns[prefix] = []
+                    for field in prefix_model._meta.local_fields:
+                        if field.concrete:
+                            subclass_columns[prefix].append(len(columns))
+                            columns.append((prefix + LOOKUP_SEP + field.attname, field))
+
+        # the fields of the base model are selected by attname and those of
+        # the subclasses under an alias, which is what the union can be
+        # ordered by
+        column_names = {'pk': model._meta.pk.attname}
+        for position, (lookup, field) in enumerate(columns, start=1):
+            prefix = lookup.rpartition(LOOKUP_SEP)[0]
+            name = f'union_column_{position}' if prefix else lookup
+            column_names[lookup] = name
+            column_names[LOOKUP_SEP.join(filter(None, (prefix, field.name)))] = name
+
+        base: QuerySet[Any] = QuerySet(model=model, query=query.chain(), using=queryset.db)
+        base.query.clear_ordering(force=True)
+        base.query.clear_limits()
+
+        def outermost(paths: Iterable[str]) -> list[str]:
+            paths = list(paths)
+            return [
+                path for path in paths
+                if not any(path.startswith(other + LOOKUP_SEP) for other in paths)
+            ]
+
+        branch_querysets = []
+        branches = []
+        for index, path in enumerate(['', *selected]):
+            branch = base.all()
+            if path:
+                branch = branch.filter(**{path + LOOKUP_SEP + 'isnull': False})
+                deeper = [other for other in selected if other.startswith(path + LOOKUP_SEP)]
+                branch_model = self._get_model_for_path(path)
+            else:
+                deeper = selected
+                branch_model = model
+            for other in outermost(deeper):
+                branch = branch.filter(**{other + LOOKUP_SEP + 'isnull': True})
+
+            joined = {prefix for prefix in subclass_columns if prefix == path or path.startswith(prefix + LOOKUP_SEP)}
+            annotations: dict[str, Any] = {
+                'union_branch': models.Value(index, output_field=models.IntegerField()),
+            }
+            positions = {}
+            for position, (lookup, field) in enumerate(columns, start=1):
+                prefix = lookup.rpartition(LOOKUP_SEP)[0]
+                if prefix in joined:
+                    annotations[column_names[lookup]] = models.F(lookup)
+                elif prefix:
+                    # some databases can't match an untyped NULL with the
+                    # column of another branch
+                    annotations[column_names[lookup]] = Cast(
+                        models.Value(None), output_field=field)
+                    continue
+                positions[field] = position
+            branch_querysets.append(branch.annotate(**annotations).values_list(
+                'union_branch', *(column_names[lookup] for lookup, field in columns)))
+
+            field_names = []
+            field_positions = []
+            for field in branch_model._meta.fields:
+                if field.concrete:
+                    field_names.append(field.attname)
+                    field_positions.append(positions[field])
+            branches.append((branch_model, field_names, field_positions))
+
+        union = branch_querysets[0]
+        if len(branch_querysets) > 1:
+            union = union.union(*branch_querysets[1:], all=True)
+        ordering = query.order_by or (model._meta.ordering if query.default_ordering else ())
+        if ordering:
+            union_ordering = []
+            for term in ordering:
+                if not isinstance(term, str) or term.lstrip('-') not in column_names:
+                    raise NotSupportedError(
+                        "select_subclasses(strategy='union') can only be ordered "
+                        f"by fields of the selected models, not {term!r}."
+                    )
+                name = term.lstrip('-')
+                union_ordering.append(term[:len(term) - len(name)] + column_names[name])
+            union = union.order_by(*union_ordering)
+        if query.is_sliced:
+            union = union[query.low_mark:query.high_mark]
+        return union, branches
+
     def _get_sub_obj_recurse(self, obj: models.Model, s: str) -> ModelT | None:
         rel, _, s = s.partition(LOOKUP_SEP)
 
@@ -194,7 +802,210 @@ class InheritanceQuerySetMixin(Generic[ModelT]):
             return node
 
     def get_subclass(self, *args: object, **kwargs: object) -> ModelT:
-        return self.select_subclasses().get(*args, **kwargs)
+        identity_map = _identity_map.get()
+        if (
+            (identity_map is None and self._subclass_cache is None)
+            or args
+            or set(kwargs) != {'pk'}
+        ):
+            return self.select_subclasses().get(*args, **kwargs)
+
+        try:
+            pk = self.model._meta.pk.to_python(kwargs['pk'])
+        except ValidationError:
+            return self.select_subclasses().get(**kwargs)
+        if identity_map is None or not self._can_use_identity_map():
+            return self._get_subclass_by_pk(pk)
+
+        key = self._identity_map_key(pk)
+        obj = identity_map.get(key)
+        if not isinstance(obj, self.model):
+            obj = self._get_subclass_by_pk(pk)
+            identity_map[key] = obj
+        return obj
+
+    def _get_subclass_by_pk(self, pk: Any) -> ModelT:
+        """
+        Fetch the object with the given primary key as an instance of its
+        subclass. When the subclass cache knows which subclass that is,
+        only the tables of that subclass and its own subclasses are joined.
+        """
+        cache = self._subclass_cache
+        if cache is None:
+            return self.select_subclasses().get(pk=pk)
+
+        key = _get_subclass_cache_key(self._get_subclass_cache_db(), self.model, pk)
+        label = cache.get(key)
+        try:
+            model = apps.get_model(label) if label is not None else None
+        except LookupError:
+            model = None
+        if model is not None and model is not self.model and issubclass(model, self.model):
+            path = self._get_ancestors_path(model)
+            subclasses = [
+                subclass for subclass in self._get_subclasses_recurse(self.model)
+                if subclass == path or subclass.startswith(path + LOOKUP_SEP)
+            ]
+            obj = self.select_subclasses(*subclasses).get(pk=pk)
+            if type(obj) is model:
+                return obj
+            # the object's subclass changed since it was cached
+            cache.delete(key)
+        return self.select_subclasses().get(pk=pk)
+
+    def _get_subclass_cache_db(self) -> str:
+        # Deletes evict the key of the database they write to, which routers
+        # may tell apart from the one read from.
+        queryset = cast(QuerySet[ModelT], self)
+        # django-stubs doesn't include this private API.
+        db, hints = queryset._db, queryset._hints  # type: ignore[attr-defined]
+        return db or router.db_for_write(self.model, **hints)
+
+    def _get_definitive_subclass_models(self) -> set[type[models.Model]]:
+        """
+        Return the models which, when the results of this queryset are
+        instances of them, are known to be their most specific subclass
+        because all of the model's own subclasses are selected.
+        """
+        selected = set(self.subclasses)
+        all_subclasses = self._get_subclasses_recurse(self.model)
+        definitive: set[type[models.Model]] = set()
+        if selected.issuperset(all_subclasses):
+            definitive.add(self.model)
+        for path in selected:
+            if selected.issuperset(
+                subclass for subclass in all_subclasses
+                if subclass.startswith(path + LOOKUP_SEP)
+            ):
+                definitive.add(self._get_model_for_path(path))
+        return definitive
+
+    def _populate_subclass_cache(self, objs: Iterator[ModelT]) -> Iterator[ModelT]:
+        """
+        Record the subclass of the objects as they are iterated over in the
+        subclass cache, in batches.
+        """
+        cache = self._subclass_cache
+        assert cache is not None
+        definitive = self._get_definitive_subclass_models()
+        db = self._get_subclass_cache_db()
+        pending: dict[str, str] = {}
+        for obj in objs:
+            model = type(obj)
+            if model in definitive:
+                pending[_get_subclass_cache_key(db, model, obj.pk)] = model._meta.label
+                if len(pending) >= 100:
+                    cache.set_many(pending)
+                    pending = {}
+            yield obj
+        if pending:
+            cache.set_many(pending)
+
+    def bulk_create_subclass(
+        self, objs: Iterable[ModelT], batch_size: int | None = None
+    ) -> list[ModelT]:
+        """
+        Insert instances of a model using multi-table inheritance in bulk:
+        the rows of each table in its inheritance chain are inserted in
+        batches, topmost table first, and the primary keys of each level are
+        copied into the parent link fields of the next.
+
+        As with bulk_create(), save() isn't called and no signals are sent.
+        If the database can't return primary keys from bulk inserts, the
+        rows of a table whose primary key must be generated by the database
+        are inserted one at a time; the other tables are still batched.
+        """
+        if batch_size is not None and batch_size <= 0:
+            raise ValueError('Batch size must be a positive integer.')
+        objs = list(objs)
+        if not objs:
+            return objs
+        model = type(objs[0])._meta.concrete_model
+        assert model is not None
+        if not issubclass(model, self.model):
+            raise ValueError(
+                f'{model.__name__} is not a subclass of {self.model.__name__}.'
+            )
+        if any(type(obj)._meta.concrete_model is not model for obj in objs):
+            raise ValueError(
+                'bulk_create_subclass() requires all objects to be instances '
+                'of the same model.'
+            )
+
+        self._for_write = True
+        db = cast(QuerySet[ModelT], self).db
+        # concrete models of the inheritance chain, ancestors first
+        levels: list[type[models.Model]] = [*reversed(model._meta.get_parent_list()), model]
+        instances = cast(list[models.Model], objs)
+        # a primary key assigned to a subclass is also that of its ancestors
+        for level in reversed(levels):
+            for parent, link in level._meta.parents.items():
+                if isinstance(link, OneToOneField):
+                    for obj in instances:
+                        if obj._get_pk_val(parent._meta) is None:
+                            setattr(obj, parent._meta.pk.attname, getattr(obj, link.attname))
+        with transaction.atomic(using=db, savepoint=False):
+            for level in levels:
+                self._bulk_insert_level(level, instances, batch_size, db)
+
+        for obj in objs:
+            obj._state.adding = False
+            obj._state.db = db
+        return objs
+
+    def _bulk_insert_level(
+        self,
+        model: type[models.Model],
+        objs: Sequence[models.Model],
+        batch_size: int | None,
+        db: str,
+    ) -> None:
+        """
+        Insert the rows of the table of ``model``, one of the concrete models
+        in the inheritance chain of ``objs``, setting the primary keys and
+        other database-returned fields of that table on the objects.
+        """
+        opts = model._meta
+        queryset: QuerySet[models.Model] = QuerySet(model=model, using=db)
+        for parent, link in opts.parents.items():
+            if isinstance(link, OneToOneField):
+                for obj in objs:
+                    setattr(obj, link.attname, obj._get_pk_val(parent._meta))
+        fields = [
+            field for field in opts.local_fields
+            if field.concrete and not getattr(field, 'generated', False)
+        ]
+        for obj in objs:
+            if obj._get_pk_val(opts) is None:
+                # django-stubs doesn't include this private API.
+                pk_value = opts.pk.get_pk_value_on_save(obj)  # type: ignore[attr-defined]
+                setattr(obj, opts.pk.attname, pk_value)
+
+        objs_with_pk = [obj for obj in objs if obj._get_pk_val(opts) is not None]
+        objs_without_pk = [obj for obj in objs if obj._get_pk_val(opts) is None]
+        # django-stubs doesn't include these private APIs.
+        if objs_with_pk:
+            queryset._batched_insert(objs_with_pk, fields, batch_size)  # type: ignore[attr-defined]
+        if objs_without_pk:
+            fields = [
+                field for field in fields
+                if not isinstance(field, models.AutoField)
+            ]
+            returning_fields = opts.db_returning_fields
+            if connections[db].features.can_return_rows_from_bulk_insert:
+                returned_rows = queryset._batched_insert(  # type: ignore[attr-defined]
+                    objs_without_pk, fields, batch_size,
+                )
+            else:
+                returned_rows = [
+                    queryset._insert(  # type: ignore[attr-defined]
+                        [obj], fields=fields, returning_fields=returning_fields, using=db,
+                    )[0]
+                    for obj in objs_without_pk
+                ]
+            for obj, results in zip(objs_without_pk, returned_rows):
+                for result, field in zip(results, returning_fields):
+                    setattr(obj, field.attname, result)
 
 
 # Defining the 'model' attribute using a generic type triggers a bug in mypy:
@@ -203,29 +1014,135 @@ class InheritanceQuerySet(InheritanceQuerySetMixin[ModelT], QuerySet[ModelT]):
         """
         Fetch only objects that are instances of the provided model(s).
         """
-        # If we aren't already selecting the subclasses, we need
-        # to in order to get this to work.
-
-        # How can we tell if we are not selecting subclasses?
-
-        # Is it safe to just apply .select_subclasses(*models)?
+        paths = [self._get_ancestors_path(model) for model in models]
+        queryset = self.select_subclasses(*models)
+        # The queryset's own model has an empty path, and every object is an
+        # instance of it.
+        if paths and all(paths):
+            queryset = queryset.filter(reduce(operator.or_, (
+                Q(**{path + LOOKUP_SEP + 'isnull': False}) for path in paths
+            )))
+        queryset._instance_of_models = models
+        return queryset
+
+    def update(self, **kwargs: Any) -> int:
+        """
+        After instance_of() with a single subclass, fields of that subclass
+        can also be updated; this runs one UPDATE per table involved,
+        restricted by a subquery on the primary keys of this queryset.
+        """
+        if (
+            len(self._instance_of_models) == 1
+            and not self.query.is_sliced
+            and not self.query.combinator
+        ):
+            model = self._instance_of_models[0]
+            try:
+                for name in kwargs:
+                    self.model._meta.get_field(name)
+            except FieldDoesNotExist:
+                return model._base_manager.using(self.db).filter(
+                    pk__in=self.order_by().values('pk')).update(**kwargs)
+        return super().update(**kwargs)
 
-        # Due to https://code.djangoproject.com/ticket/16572, we
-        # can't really do this for anything other than children (ie,
-        # no grandchildren+).
-        where_queries = []
-        for model in models:
-            where_queries.append('(' + ' AND '.join([
-                '"{}"."{}" IS NOT NULL'.format(
-                    model._meta.db_table,
-                    field.column,
-                ) for field in model._meta.parents.values()
-            ]) + ')')
+    def delete(self) -> tuple[int, dict[str, int]]:
+        """
+        After instance_of(), delete the objects with one DELETE statement per
+        table and batch of primary keys, without loading the objects, when
+        no delete signal receivers or cascades require Django's collector.
+        """
+        if (
+            not self._instance_of_models
+            or self.query.is_sliced
+            or self.query.distinct
+            or self.query.combinator
+            # django-stubs doesn't include this private API.
+            or self._fields is not None  # type: ignore[attr-defined]
+        ):
+            return super().delete()
+
+        self._for_write = True
+        db = self.db
+        plan = self._get_raw_delete_plan(db)
+        if plan is None:
+            return super().delete()
+
+        pks = list(self.order_by().values_list('pk', flat=True))
+        batch_size = max(connections[db].ops.bulk_batch_size(['pk'], pks), 1)
+        deleted: Counter[str] = Counter()
+        with transaction.atomic(using=db, savepoint=False):
+            for start in range(0, len(pks), batch_size):
+                batch = pks[start:start + batch_size]
+                for model, related_fields in plan:
+                    for related_field in related_fields:
+                        related_model = related_field.model
+                        deleted[related_model._meta.label] += (
+                            related_model._base_manager.using(db)
+                            .filter(**{related_field.name + '__in': batch})
+                            # django-stubs doesn't include this private API.
+                            ._raw_delete(db)  # type: ignore[attr-defined]
+                        )
+                    deleted[model._meta.label] += (
+                        model._base_manager.using(db)
+                        .filter(pk__in=batch)
+                        ._raw_delete(db)  # type: ignore[attr-defined]
+                    )
+        counts = {label: count for label, count in deleted.items() if count}
+        return sum(counts.values()), counts
 
-        return cast(
-            'InheritanceQuerySet[ModelT]',
-            self.select_subclasses(*models).extra(where=[' OR '.join(where_queries)])
-        )
+    def _get_raw_delete_plan(
+        self, db: str
+    ) -> list[tuple[type[models.Model], list[models.Field[Any, Any]]]] | None:
+        """
+        Return the tables to delete the rows of the instance_of() models
+        from, most derived first, each with the foreign keys whose rows
+        must be deleted first. Return None if that's not possible without
+        Django's collector.
+        """
+        subclasses = [
+            self._get_model_for_path(path)
+            for path in self._get_subclasses_recurse(self.model)
+        ]
+        affected: set[type[models.Model]] = set()
+        for model in self._instance_of_models:
+            affected.update(model._meta.get_parent_list())
+            affected.add(model)
+            affected.update(
+                subclass for subclass in subclasses if issubclass(subclass, model))
+
+        collector = Collector(using=db)
+        plan = []
+        for model in sorted(
+            affected, key=lambda model: len(model._meta.get_parent_list()), reverse=True
+        ):
+            opts = model._meta
+            if (
+                models.signals.pre_delete.has_listeners(model)
+                or models.signals.post_delete.has_listeners(model)
+                or any(hasattr(field, 'bulk_related_objects') for field in opts.private_fields)
+            ):
+                return None
+            related_fields = []
+            for related in get_candidate_relations_to_delete(opts):
+                if related.model is not model:
+                    # inherited from a parent, handled with the parent's table
+                    continue
+                # django-stubs types these relations as fields.
+                field = related.field  # type: ignore[attr-defined]
+                if field.remote_field.parent_link:
+                    # The tables of the affected subclasses are deleted from
+                    # anyway, and rows of other subclasses can't share the
+                    # primary keys of the affected objects.
+                    continue
+                if field.remote_field.on_delete is models.DO_NOTHING:
+                    continue
+                if not collector.can_fast_delete(
+                    field.model._base_manager.using(db).all(), from_field=field
+                ):
+                    return None
+                related_fields.append(field)
+            plan.append((model, related_fields))
+        return plan
 
 
 class InheritanceManagerMixin(Generic[ModelT]):
@@ -304,14 +1221,49 @@ class InheritanceManagerMixin(Generic[ModelT]):
         def using(self, alias: str | None) -> InheritanceQuerySet[ModelT]:
             ...
 
+    def __init__(self, *args: Any, subclass_cache: CacheBackend | None = None, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.subclass_cache = subclass_cache
+
+    def contribute_to_class(self, cls: type[models.Model], name: str) -> None:
+        # django-stubs doesn't know this mixin is used with a Manager.
+        super().contribute_to_class(cls, name)  # type: ignore[misc]
+        if self.subclass_cache is not None and not cls._meta.abstract:
+            models.signals.class_prepared.connect(self._connect_subclass_cache, sender=cls)
+
+    def _connect_subclass_cache(self, sender: type[models.Model], **kwargs: Any) -> None:
+        # The instances of parent models are deleted along with subclass
+        # instances, so listening to the topmost concrete model is enough.
+        models.signals.post_delete.connect(
+            self._evict_from_subclass_cache,
+            sender=_get_root_model(sender),
+            dispatch_uid=f'model_utils_subclass_cache_{id(self)}',
+        )
+
+    def _evict_from_subclass_cache(
+        self, sender: type[models.Model], instance: models.Model, using: str, **kwargs: Any
+    ) -> None:
+        assert self.subclass_cache is not None
+        self.subclass_cache.delete(_get_subclass_cache_key(using, sender, instance.pk))
+
     def get_queryset(self) -> InheritanceQuerySet[ModelT]:
         model: type[ModelT] = self.model  # type: ignore[attr-defined]
-        return self._queryset_class(model)
+        queryset: InheritanceQuerySet[ModelT] = self._queryset_class(model)
+        queryset._subclass_cache = self.subclass_cache
+        return queryset
 
     def select_subclasses(
-        self, *subclasses: str | type[models.Model]
+        self,
+        *subclasses: str | type[models.Model],
+        fields: Mapping[type[models.Model], Iterable[str]] | None = None,
+        strategy: str = 'join',
+        max_depth: int | None = None,
+        leaves_only: bool = False,
     ) -> InheritanceQuerySet[ModelT]:
-        return self.get_queryset().select_subclasses(*subclasses)
+        return self.get_queryset().select_subclasses(
+            *subclasses, fields=fields, strategy=strategy,
+            max_depth=max_depth, leaves_only=leaves_only,
+        )
 
     def get_subclass(self, *args: object, **kwargs: object) -> ModelT:
         return self.get_queryset().get_subclass(*args, **kwargs)
@@ -319,12 +1271,265 @@ class InheritanceManagerMixin(Generic[ModelT]):
     def instance_of(self, *models: type[ModelT]) -> InheritanceQuerySet[ModelT]:
         return self.get_queryset().instance_of(*models)
 
+    def bulk_create_subclass(
+        self, objs: Iterable[ModelT], batch_size: int | None = None
+    ) -> list[ModelT]:
+        return self.get_queryset().bulk_create_subclass(objs, batch_size=batch_size)
+
+    async def aget_subclass(self, *args: object, **kwargs: object) -> ModelT:
+        return await self.get_queryset().aget_subclass(*args, **kwargs)
+
+    def ainstance_of(self, *models: type[ModelT]) -> AsyncIterator[ModelT]:
+        return self.get_queryset().ainstance_of(*models)
+
+    def subclass_counts(self) -> dict[type[models.Model], int]:
+        return self.get_queryset().subclass_counts()
+
+    def with_subclass_label(self, name: str) -> InheritanceQuerySet[ModelT]:
+        return self.get_queryset().with_subclass_label(name)
+
+    def prefetch_subclass_related(
+        self,
+        lookups: Mapping[type[models.Model], Sequence[str | Prefetch]] | None,
+    ) -> InheritanceQuerySet[ModelT]:
+        return self.get_queryset().prefetch_subclass_related(lookups)
+
 
 class InheritanceManager(InheritanceManagerMixin[ModelT], models.Manager[ModelT]):
     pass
 
 
-class QueryManagerMixin(Generic[ModelT]):
+def _evict_from_identity_map(
+    sender: type[models.Model], instance: models.Model, using: str, **kwargs: Any
+) -> None:
+    identity_map = _identity_map.get()
+    if identity_map:
+        identity_map.pop((using, _get_root_model(sender), instance.pk), None)
+
+
+class InheritanceIdentityMap(ContextDecorator):
+    """
+    Within this context, InheritanceManager caches the instances resolved
+    by get_subclass(pk=...) and select_subclasses().filter(pk__in=...),
+    serving repeated lookups of the same objects from memory. Saving or
+    deleting an instance evicts it.
+
+    Can be used as a context manager or as a decorator, e.g. of a view or
+    of the ``get_response`` callable of a middleware. The cache is bound to
+    the current thread or asyncio task.
+    """
+
+    # The save and delete signal receivers are only connected while an
+    # identity map is active, since having any post_delete receiver
+    # disables fast deletes for every model.
+    _active_count = 0
+    _lock = threading.Lock()
+
+    def __enter__(self) -> InheritanceIdentityMap:
+        with self._lock:
+            if not InheritanceIdentityMap._active_count:
+                models.signals.post_save.connect(
+                    _evict_from_identity_map, dispatch_uid='model_utils_identity_map')
+                models.signals.post_delete.connect(
+                    _evict_from_identity_map, dispatch_uid='model_utils_identity_map')
+            InheritanceIdentityMap._active_count += 1
+        token = _identity_map.set({})
+        _identity_map_tokens.set((*_identity_map_tokens.get(), token))
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        try:
+            *tokens, token = _identity_map_tokens.get()
+            _identity_map_tokens.set(tuple(tokens))
+            _identity_map.reset(token)
+        finally:
+            with self._lock:
+                InheritanceIdentityMap._active_count -= 1
+                if not InheritanceIdentityMap._active_count:
+                    models.signals.post_save.disconnect(dispatch_uid='model_utils_identity_map')
+                    models.signals.post_delete.disconnect(dispatch_uid='model_utils_identity_map')
+
+
+def chunk_queryset(queryset: QuerySet[ModelT], size: int = 1000) -> Iterator[QuerySet[ModelT]]:
+    """
+    Yield querysets over consecutive, disjoint ranges of primary keys, each
+    matching at most ``size`` objects of ``queryset``. The end of each range
+    is found by seeking past the previous one, rather than with an OFFSET
+    growing with each range, and objects created with primary keys beyond
+    the largest one at the start are left out.
+    """
+    if size < 1:
+        raise ValueError('size must be a positive integer.')
+    bounds = queryset.aggregate(min_pk=models.Min('pk'), max_pk=models.Max('pk'))
+    if bounds['min_pk'] is None:
+        return
+    max_pk = bounds['max_pk']
+    pks = queryset.order_by('pk').values_list('pk', flat=True)
+    lower = Q(pk__gte=bounds['min_pk'])
+    while True:
+        upper = list(pks.filter(lower)[size - 1:size])
+        if not upper or upper[0] >= max_pk:
+            yield queryset.filter(lower, pk__lte=max_pk)
+            return
+        yield queryset.filter(lower, pk__lte=upper[0])
+        lower = Q(pk__gt=upper[0])
+
+
+def _process_chunk(
+    fn: Callable[[QuerySet[ModelT]], T],
+    queryset_class: type[QuerySet[ModelT]],
+    model: type[ModelT],
+    query: Any,
+    db: str,
+) -> T:
+    # Querysets are evaluated when pickled, so the chunks are passed to
+    # worker processes as their queries.
+    queryset = queryset_class(model=model, query=query, using=db)
+    try:
+        return fn(queryset)
+    finally:
+        # Each worker uses its own connections.
+        connections.close_all()
+
+
+def _init_worker_process() -> None:
+    if not apps.ready:
+        # The process was spawned rather than forked.
+        import django
+        django.setup()
+
+
+def process_in_parallel(
+    queryset: QuerySet[ModelT],
+    fn: Callable[[QuerySet[ModelT]], T],
+    workers: int = 4,
+    chunk_size: int = 1000,
+    processes: bool = False,
+) -> list[T]:
+    """
+    Call ``fn`` on each of the querysets yielded by
+    ``chunk_queryset(queryset, chunk_size)``, using a pool of ``workers``
+    threads, or processes if ``processes`` is set, and return the results in
+    the order of the chunks.
+    """
+    executor: concurrent.futures.Executor
+    if processes:
+        # Forked processes mustn't share the connections of this one.
+        connections.close_all()
+        executor = concurrent.futures.ProcessPoolExecutor(
+            workers, initializer=_init_worker_process)
+    else:
+        executor = concurrent.futures.ThreadPoolExecutor(workers)
+    with executor:
+        futures = [
+            executor.submit(
+                _process_chunk, fn, type(chunk), chunk.model, chunk.query, chunk.db)
+            for chunk in chunk_queryset(queryset, chunk_size)
+        ]
+        return [future.result() for future in futures]
+
+
+class ChunkedManagerMixin(Generic[ModelT]):
+    """
+    Manager methods processing the objects of large querysets in chunks.
+    """
+
+    def chunked(self, size: int = 1000) -> Iterator[QuerySet[ModelT]]:
+        """
+        Yield querysets over disjoint ranges of primary keys of the manager's
+        objects, each matching at most ``size`` objects.
+        """
+        # django-stubs doesn't know this mixin is used with a Manager.
+        return chunk_queryset(self.get_queryset(), size)  # type: ignore[attr-defined]
+
+    def process_in_parallel(
+        self,
+        fn: Callable[[QuerySet[ModelT]], T],
+        workers: int = 4,
+        chunk_size: int = 1000,
+        processes: bool = False,
+    ) -> list[T]:
+        """
+        Call ``fn`` on chunks of the manager's objects in a pool of threads
+        or processes, and return the results.
+        """
+        return process_in_parallel(
+            self.get_queryset(),  # type: ignore[attr-defined]
+            fn, workers, chunk_size, processes,
+        )
+
+
+# The default cache of QueryManager.cached(), shared by all managers.
+query_manager_cache = LRUCache(maxsize=1000)
+
+# The database aliases QueryManager.read_from() reads from, and when the
+# current thread or task last wrote an object of each model read from one,
+# by the label of its concrete model. The mapping is replaced rather than
+# changed, as it may be shared with the contexts copied from this one.
+read_replicas: set[str] = set()
+_last_writes: ContextVar[Mapping[str, float]] = ContextVar('model_utils_last_writes', default={})
+
+
+def _record_write(sender: type[models.Model], **kwargs: Any) -> None:
+    label = sender._meta.concrete_model._meta.label  # type: ignore[union-attr]
+    _last_writes.set({**_last_writes.get(), label: time.monotonic()})
+
+
+def _forget_writes(**kwargs: Any) -> None:
+    # Sync servers reuse their threads, and with them the context, for
+    # the following requests.
+    if _last_writes.get():
+        _last_writes.set({})
+
+
+request_finished.connect(_forget_writes, dispatch_uid='model_utils_forget_writes')
+
+
+def get_read_db(
+    model: type[models.Model], alias: str, primary: str, pin_seconds: float = 0
+) -> str:
+    """
+    Return ``alias``, or ``primary`` within a transaction on it or within
+    ``pin_seconds`` of the last write of an object of ``model`` by the
+    current thread or task in the current request, which the replica may
+    not have caught up with yet.
+    """
+    if connections[primary].in_atomic_block:
+        return primary
+    label = model._meta.concrete_model._meta.label  # type: ignore[union-attr]
+    last_write = _last_writes.get().get(label)
+    if last_write is not None and time.monotonic() - last_write < pin_seconds:
+        return primary
+    return alias
+
+
+if TYPE_CHECKING:
+    class CachedModelIterable(ModelIterable[ModelT]):
+        queryset: QuerySet[ModelT]
+
+        def __init__(self, queryset: QuerySet[ModelT], *args: Any, **kwargs: Any):
+            ...
+
+        def __iter__(self) -> Iterator[ModelT]:
+            ...
+
+else:
+    class CachedModelIterable(ModelIterable):
+        """
+        Iterable of the querysets of cached QueryManagers, serving the
+        results of those returned by the manager from its cache.
+        """
+
+        def __iter__(self):
+            queryset = self.queryset
+            name = getattr(queryset, '_cached_by', None)
+            if name is None or self.chunked_fetch:
+                return super().__iter__()
+            manager = queryset.model._meta.managers_map[name]
+            return iter(manager._get_cached_results(queryset, super().__iter__()))
+
+
+class QueryManagerMixin(ChunkedManagerMixin[ModelT]):
 
     @overload
     def __init__(self, *args: models.Q):
@@ -340,45 +1545,601 @@ class QueryManagerMixin(Generic[ModelT]):
         else:
             self._q = models.Q(**kwargs)
         self._order_by: tuple[Any, ...] | None = None
+        self._index_options: tuple[str | None, Sequence[str] | None] | None = None
+        self._cache: CacheBackend | None = None
+        self._cache_timeout: float | None = None
+        self._cache_pks_only = False
+        self._read_from: tuple[str, float] | None = None
         super().__init__()
 
     def order_by(self, *args: Any) -> QueryManager[ModelT]:
         self._order_by = args
         return cast('QueryManager[ModelT]', self)
 
+    def indexed(
+        self, name: str | None = None, fields: Sequence[str] | None = None
+    ) -> QueryManager[ModelT]:
+        """
+        Add a partial index on the manager's condition to the model. Its
+        fields default to the ordering of the manager, or to the primary key.
+        """
+        self._index_options = (name, fields)
+        return cast('QueryManager[ModelT]', self)
+
+    def cached(
+        self,
+        timeout: float = 300,
+        backend: CacheBackend | None = None,
+        pks_only: bool = False,
+    ) -> QueryManager[ModelT]:
+        """
+        Cache the results of the manager's queryset, or only their primary
+        keys, until an instance of the model is saved or deleted, or for at
+        most ``timeout`` seconds.
+        """
+        # Writes not sending the save and delete signals don't clear the
+        # cache, so the results must expire.
+        if timeout is None or timeout <= 0:
+            raise ValueError('timeout must be a positive number of seconds.')
+        self._cache = backend if backend is not None else query_manager_cache
+        self._cache_timeout = timeout
+        self._cache_pks_only = pks_only
+        return cast('QueryManager[ModelT]', self)
+
+    def read_from(self, alias: str, pin_seconds: float = 0) -> QueryManager[ModelT]:
+        """
+        Read the manager's objects from the database ``alias``, except within
+        a transaction or ``pin_seconds`` after a write of an object of the
+        model. Requires ``model_utils.routers.ReadReplicaRouter``.
+        """
+        read_replicas.add(alias)
+        self._read_from = (alias, pin_seconds)
+        return cast('QueryManager[ModelT]', self)
+
+    def contribute_to_class(self, cls: type[models.Model], name: str) -> None:
+        # django-stubs doesn't know this mixin is used with a Manager.
+        super().contribute_to_class(cls, name)  # type: ignore[misc]
+        if self._index_options is None and self._cache is None and self._read_from is None:
+            return
+        if cls._meta.abstract:
+            models.signals.class_prepared.connect(self._prepare_subclass)
+            return
+        # The primary key may not have been added yet, so the index is added
+        # once the model is prepared.
+        if self._index_options is not None and not cls._meta.proxy:
+            models.signals.class_prepared.connect(self._add_index, sender=cls)
+        self._connect_signals(cls)
+
+    def _prepare_subclass(self, sender: type[models.Model], **kwargs: Any) -> None:
+        # The managers of abstract models are inherited without being
+        # contributed to the subclasses.
+        # django-stubs doesn't know this mixin is used with a Manager.
+        abstract_model, name = self.model, self.name  # type: ignore[attr-defined]
+        if (
+            sender._meta.abstract
+            or sender._meta.proxy
+            # a concrete parent was already set up
+            or any(issubclass(parent, abstract_model) for parent in sender._meta.parents)
+        ):
+            return
+        declaring = next((klass for klass in sender.__mro__ if name in vars(klass)), None)
+        if declaring is abstract_model:
+            if self._index_options is not None:
+                self._add_index(sender)
+            self._connect_signals(sender)
+
+    def _connect_signals(self, model: type[models.Model]) -> None:
+        if self._cache is not None:
+            models.signals.post_save.connect(self._invalidate_cache_on_save, sender=model)
+            models.signals.post_delete.connect(self._invalidate_cache, sender=model)
+        if self._read_from is not None and self._read_from[1]:
+            models.signals.post_save.connect(_record_write, sender=model)
+            models.signals.post_delete.connect(_record_write, sender=model)
+
+    def _add_index(self, sender: type[models.Model], **kwargs: Any) -> None:
+        assert self._index_options is not None
+        index_name, fields = self._index_options
+        if fields is None:
+            if not self._order_by:
+                fields = [sender._meta.pk.name]
+            elif all(isinstance(field, str) for field in self._order_by):
+                fields = self._order_by
+            else:
+                raise ValueError(
+                    'The fields of the index must be given when ordering by expressions.')
+        if index_name is None:
+            # Django's generated names don't depend on the condition, so
+            # managers indexing the same fields would clash.
+            db_table = sender._meta.db_table
+            # django-stubs doesn't know this mixin is used with a Manager.
+            manager_name: str = self.name  # type: ignore[attr-defined]
+            digest = names_digest(db_table, manager_name, *fields, length=6)
+            index_name = f'{db_table[:11]}_{manager_name[:7]}_{digest}_qm'
+        sender._meta.indexes = [
+            *sender._meta.indexes,
+            models.Index(fields=list(fields), condition=self._q, name=index_name),
+        ]
+        # Migrations only include the indexes of models declaring some.
+        sender._meta.original_attrs['indexes'] = sender._meta.indexes
+
+    def after(
+        self, cursor: str | None = None, limit: int = 50
+    ) -> tuple[list[ModelT], str | None]:
+        """
+        Return a page of at most ``limit`` objects following ``cursor``, in
+        the manager's order, and the cursor of the next page, if any.
+        """
+        qs = self.get_queryset()
+        if self._order_by is not None:
+            ordering = self._order_by
+        else:
+            # django-stubs doesn't know this mixin is used with a Manager.
+            ordering = self.model._meta.ordering  # type: ignore[attr-defined]
+        return paginate_by_keyset(qs, ordering, cursor, limit)
+
+    def _get_cache_key(self, model: type[models.Model], db: str) -> str:
+        # django-stubs doesn't know this mixin is used with a Manager.
+        name = self.name  # type: ignore[attr-defined]
+        return f'model_utils:query_manager:{db}:{model._meta.label_lower}:{name}'
+
+    def _invalidate_cache(
+        self, sender: type[models.Model], instance: models.Model, using: str, **kwargs: Any
+    ) -> None:
+        assert self._cache is not None
+        self._cache.delete(self._get_cache_key(sender, using))
+
+    def _invalidate_cache_on_save(
+        self, sender: type[models.Model], instance: models.Model, created: bool, **kwargs: Any
+    ) -> None:
+        # Cached instances are stale after any change, but cached primary
+        # keys only if the saved instance may have started or stopped
+        # matching the condition.
+        if created or not self._cache_pks_only or self._condition_may_have_changed(sender, instance):
+            self._invalidate_cache(sender, instance, **kwargs)
+
+    def _condition_may_have_changed(
+        self, sender: type[models.Model], instance: models.Model
+    ) -> bool:
+        """
+        Tell whether the fields the condition refers to may have changed,
+        from the field trackers of the model.
+        """
+        names = _get_lookup_field_names(self._q)
+        if names is None:
+            return True
+        trackers = [
+            getattr(instance, tracker.attname)
+            for klass in sender.__mro__
+            for tracker in vars(klass).values()
+            if isinstance(tracker, FieldTracker)
+        ]
+        for name in names:
+            try:
+                field = sender._meta.get_field(name)
+            except FieldDoesNotExist:
+                return True
+            for tracker in trackers:
+                tracked = {field.name, getattr(field, 'attname', None)} & set(tracker.fields)
+                if tracked:
+                    if tracker.has_changed(tracked.pop()):
+                        return True
+                    break
+            else:
+                return True
+        return False
+
     def get_queryset(self) -> QuerySet[ModelT]:
         qs = super().get_queryset()  # type: ignore[misc]
+        if self._read_from is not None:
+            # The router reads the hint when the queryset is evaluated, so
+            # that writes through it still go to the primary.
+            qs._hints = {**qs._hints, 'read_from': self._read_from}
         qs = qs.filter(self._q)
         if self._order_by is not None:
-            return qs.order_by(*self._order_by)
+            qs = qs.order_by(*self._order_by)
+        if self._cache is not None and qs._iterable_class is ModelIterable:
+            # Only this queryset is served from the cache when evaluated:
+            # the querysets chained from it don't copy the manager's name.
+            qs._iterable_class = CachedModelIterable
+            # django-stubs doesn't know this mixin is used with a Manager.
+            qs._cached_by = self.name  # type: ignore[attr-defined]
         return qs
 
+    def _get_cached_results(
+        self, qs: QuerySet[ModelT], objs: Iterator[ModelT]
+    ) -> list[ModelT]:
+        """
+        Return the results of the manager's queryset ``qs`` from the cache,
+        or store those of ``objs``, the objects it fetches.
+        """
+        assert self._cache is not None
+        # Saves and deletes clear the key of the database they write to,
+        # which routers may tell apart from the one read from.
+        # django-stubs doesn't include this private API.
+        db = qs._db or router.db_for_write(qs.model, **qs._hints)  # type: ignore[attr-defined]
+        key = self._get_cache_key(qs.model, db)
+        cached = self._cache.get(key)
+        if cached is None:
+            results = list(objs)
+            if self._cache_pks_only:
+                cached = [obj.pk for obj in results]
+            else:
+                cached = [copy.copy(obj) for obj in results]
+            self._cache.set_many({key: cached}, timeout=self._cache_timeout)
+            return results
+        if self._cache_pks_only:
+            return list(qs.filter(pk__in=cached))
+        # The cached instances may be shared with other callers.
+        return [copy.copy(obj) for obj in cached]
+
+
+def _get_keyset_fields(
+    model: type[models.Model], ordering: Sequence[Any]
+) -> list[tuple[models.Field[Any, Any], bool]]:
+    """
+    Return the fields to seek on for ``ordering``, each with whether it's
+    descending, ending with the primary key so that the order is total.
+    """
+    opts = model._meta
+    assert opts.pk is not None
+    keyset = []
+    for name in ordering:
+        if not isinstance(name, str) or name == '?':
+            raise ValueError(f'Keyset pagination needs field names to order by, not {name!r}.')
+        descending = name.startswith('-')
+        name = name.lstrip('-+')
+        field = opts.pk if name == 'pk' else opts.get_field(name)
+        if not isinstance(field, models.Field) or not field.concrete:
+            raise ValueError(f'Keyset pagination can only order by fields of {opts.label}.')
+        if field.null:
+            raise ValueError(f'Keyset pagination can\'t order by the nullable field {name!r}.')
+        keyset.append((field, descending))
+        if field.primary_key or field.unique:
+            return keyset
+    keyset.append((opts.pk, False))
+    return keyset
+
+
+class _CursorEncoder(DjangoJSONEncoder):
+    def default(self, o: Any) -> Any:
+        # DjangoJSONEncoder truncates microseconds, which would make the
+        # position imprecise.
+        if isinstance(o, (datetime.datetime, datetime.time)):
+            return o.isoformat()
+        return super().default(o)
+
+
+def _encode_cursor(values: list[Any]) -> str:
+    data = json.dumps(values, cls=_CursorEncoder, separators=(',', ':'))
+    return base64.urlsafe_b64encode(data.encode()).decode().rstrip('=')
+
+
+def _decode_cursor(cursor: str, fields: list[models.Field[Any, Any]]) -> list[Any]:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        if not isinstance(values, list) or len(values) != len(fields):
+            raise ValueError
+        return [field.to_python(value) for field, value in zip(fields, values)]
+    except (ValueError, ValidationError):
+        raise ValueError(f'Invalid cursor: {cursor!r}')
+
+
+def paginate_by_keyset(
+    queryset: QuerySet[ModelT],
+    ordering: Sequence[Any],
+    cursor: str | None = None,
+    limit: int = 50,
+    keep_cursor: bool = False,
+) -> tuple[list[ModelT], str | None]:
+    """
+    Return the first ``limit`` objects of ``queryset`` ordered by
+    ``ordering`` (and then the primary key) that come after the position
+    encoded in ``cursor``, and the cursor of the last one. The last cursor
+    is None when there are no more objects, unless ``keep_cursor`` is set,
+    in which case the position is kept for later calls.
+    """
+    if limit < 1:
+        raise ValueError('limit must be a positive integer.')
+    keyset = _get_keyset_fields(queryset.model, ordering)
+    fields = [field for field, descending in keyset]
+    # Ordering by a foreign key would follow the ordering of the related
+    # model rather than the value of the column sought on.
+    queryset = queryset.order_by(*(
+        ('-' if descending else '') + field.attname for field, descending in keyset
+    ))
+    if cursor is not None:
+        values = _decode_cursor(cursor, fields)
+        # (a, b, pk) > (x, y, z) as
+        # a > x OR (a = x AND b > y) OR (a = x AND b = y AND pk > z)
+        seek = Q()
+        for index, ((field, descending), value) in enumerate(zip(keyset, values)):
+            condition = Q(**{field.attname + ('__lt' if descending else '__gt'): value})
+            for previous, previous_value in zip(fields[:index], values):
+                condition &= Q(**{previous.attname: previous_value})
+            seek |= condition
+        queryset = queryset.filter(seek)
+
+    objs = list(queryset[:limit + 1])
+    has_more = len(objs) > limit
+    objs = objs[:limit]
+    if objs and (has_more or keep_cursor):
+        cursor = _encode_cursor([
+            field.value_from_object(objs[-1]) for field in fields
+        ])
+    elif not keep_cursor:
+        cursor = None
+    return objs, cursor
+
+
+def _get_lookup_field_names(q: models.Q) -> set[str] | None:
+    """
+    Return the names of the fields of the model the lookups of ``q`` start
+    from, or None if they can't be told, such as for expressions.
+    """
+    names = set()
+    for child in q.children:
+        if isinstance(child, models.Q):
+            child_names = _get_lookup_field_names(child)
+            if child_names is None:
+                return None
+            names |= child_names
+        elif isinstance(child, tuple) and not hasattr(child[1], 'resolve_expression'):
+            names.add(child[0].split(LOOKUP_SEP)[0])
+        else:
+            return None
+    return names
+
 
 class QueryManager(QueryManagerMixin[ModelT], models.Manager[ModelT]):  # type: ignore[misc]
     pass
 
 
-class SoftDeletableQuerySetMixin(Generic[ModelT]):
+def _has_removed_at(model: type[models.Model]) -> bool:
+    return any(field.name == 'removed_at' for field in model._meta.fields)
+
+
+def _get_soft_delete_values(
+    model: type[models.Model], removed_at: datetime.datetime
+) -> dict[str, Any]:
+    if _has_removed_at(model):
+        return {'is_removed': True, 'removed_at': removed_at}
+    return {'is_removed': True}
+
+
+def _get_cascade_relations(
+    model: type[models.Model],
+) -> Iterator[tuple[ForeignObjectRel, type[models.Model]]]:
+    """
+    Yield the ``on_delete=CASCADE`` relations from soft deletable models to
+    ``model`` with their models.
+    """
+    # Imported here as model_utils.models imports this module.
+    from model_utils.models import SoftDeletableModel
+
+    # django-stubs doesn't include this private API.
+    for relation in model._meta.related_objects:  # type: ignore[attr-defined]
+        related_model = relation.related_model
+        if (
+            not relation.many_to_many
+            and relation.on_delete is models.CASCADE
+            and not relation.parent_link
+            and issubclass(related_model, SoftDeletableModel)
+        ):
+            yield relation, related_model
+
+
+def _get_unreached_pks(
+    children: QuerySet[Any], reached: defaultdict[type[models.Model], set[Any]]
+) -> set[Any]:
+    """
+    Return the primary keys of the objects of ``children``, related through
+    a relation leading back to a model the cascade already went through,
+    such as the parent of the nodes of a tree, that it didn't reach yet,
+    and record them as reached, so that cycles end.
+    """
+    pks = set(children.values_list('pk', flat=True)) - reached[children.model]
+    reached[children.model] |= pks
+    return pks
+
+
+def _cascade_soft_delete(
+    queryset: QuerySet[Any],
+    counts: Counter[str],
+    removed_at: datetime.datetime,
+    path: tuple[type[models.Model], ...] = (),
+    reached: defaultdict[type[models.Model], set[Any]] | None = None,
+) -> None:
+    """
+    Soft delete the objects related to those of ``queryset`` through
+    ``on_delete=CASCADE`` relations from soft deletable models, the most
+    distant first, with one UPDATE per relation filtering on a subquery.
+    Relations leading back to a model of ``path`` are followed by primary
+    key instead.
+    """
+    if reached is None:
+        reached = defaultdict(set)
+    path = (*path, queryset.model)
+    parents = queryset.order_by()
+    for relation, related_model in _get_cascade_relations(queryset.model):
+        children = related_model._base_manager.using(queryset.db).filter(
+            is_removed=False, **{f'{relation.field.name}__in': parents})
+        if related_model in path:
+            pks = _get_unreached_pks(children, reached)
+            if not pks:
+                continue
+            children = related_model._base_manager.using(queryset.db).filter(pk__in=pks)
+        _cascade_soft_delete(children, counts, removed_at, path, reached)
+        counts[related_model._meta.label] += children.update(
+            **_get_soft_delete_values(related_model, removed_at))
+
+
+def _cascade_restore(
+    queryset: QuerySet[Any],
+    counts: Counter[str],
+    path: tuple[type[models.Model], ...] = (),
+    reached: defaultdict[type[models.Model], set[Any]] | None = None,
+) -> None:
+    """
+    Restore the objects related to those of ``queryset`` through the
+    relations soft deletes cascade along, and removed at the same time as
+    them, the most distant first, with one UPDATE per relation.
+    """
+    if reached is None:
+        reached = defaultdict(set)
+    path = (*path, queryset.model)
+    parents = queryset.order_by()
+    for relation, related_model in _get_cascade_relations(queryset.model):
+        if not _has_removed_at(related_model):
+            # There's no telling which objects the cascade removed.
+            continue
+        children = related_model._base_manager.using(queryset.db).filter(
+            Exists(parents.filter(**{
+                relation.field.target_field.name: OuterRef(relation.field.attname),
+                'removed_at': OuterRef('removed_at'),
+            })),
+            is_removed=True,
+        )
+        if related_model in path:
+            pks = _get_unreached_pks(children, reached)
+            if not pks:
+                continue
+            children = related_model._base_manager.using(queryset.db).filter(pk__in=pks)
+        _cascade_restore(children, counts, path, reached)
+        counts[related_model._meta.label] += children.update(is_removed=False, removed_at=None)
+
+
+class RestorableQuerySetMixin(Generic[ModelT]):
+    """
+    QuerySet of soft deletable objects which can restore those marked as
+    removed.
+    """
+
+    def restore(self, cascade: bool = False) -> tuple[int, dict[str, int]]:
+        """
+        Restore the objects of the queryset marked as removed (set their
+        ``is_removed`` field to False, and clear their ``removed_at``
+        field if they have one), and with ``cascade``, the objects the
+        soft delete of them cascaded to, identified by their ``removed_at``.
+        """
+        queryset = cast(QuerySet[ModelT], self).filter(is_removed=True)
+        model = queryset.model
+        values: dict[str, Any] = {'is_removed': False}
+        if _has_removed_at(model):
+            values['removed_at'] = None
+        elif cascade:
+            raise ValueError(
+                f'{model._meta.label} has no removed_at field to find the objects '
+                f'removed with its objects.')
+        counts: Counter[str] = Counter()
+        with transaction.atomic(using=queryset.db, savepoint=False):
+            if cascade:
+                _cascade_restore(queryset, counts)
+            counts[model._meta.label] += queryset.update(**values)
+        return sum(counts.values()), dict(counts)
+
+
+def purge_removed(
+    queryset: QuerySet[Any],
+    older_than: datetime.datetime | datetime.timedelta | None = None,
+    date_field: str | None = None,
+    batch_size: int = 1000,
+    sleep: float = 0,
+    archive_to: type[models.Model] | None = None,
+    start_after: Any = None,
+    progress: Callable[[int, Any], object] | None = None,
+) -> tuple[int, dict[str, int]]:
+    """
+    Delete the objects of ``queryset`` marked as removed, in batches of at
+    most ``batch_size`` in order of primary key, each in its own transaction
+    and ``sleep`` seconds apart, so that locks are held briefly.
+
+    With ``older_than``, only the objects whose ``date_field``, by default
+    their ``removed_at`` field, is before that date, or that long ago, are
+    deleted. The objects are copied into
+    the fields of the same names of ``archive_to`` before being deleted.
+    ``progress`` is called after each batch with the number of objects
+    purged so far and the largest primary key purged, which can be passed
+    as ``start_after`` to resume an interrupted purge.
+    """
+    if batch_size < 1:
+        raise ValueError('batch_size must be a positive integer.')
+    model = queryset.model
+    queryset = queryset.filter(is_removed=True)
+    if older_than is not None:
+        if date_field is None:
+            if not _has_removed_at(model):
+                raise ValueError(
+                    'date_field must be given with older_than for models without removed_at.')
+            date_field = 'removed_at'
+        if isinstance(older_than, datetime.timedelta):
+            older_than = timezone.now() - older_than
+        queryset = queryset.filter(**{f'{date_field}__lt': older_than})
+    if start_after is not None:
+        queryset = queryset.filter(pk__gt=start_after)
+    pks = queryset.order_by('pk').values_list('pk', flat=True)
+    if archive_to is not None:
+        names = {field.attname for field in model._meta.fields if field.concrete}
+        archived = [
+            field.attname for field in archive_to._meta.fields
+            if field.concrete and field.attname in names
+        ]
+
+    purged = 0
+    counts: Counter[str] = Counter()
+    while True:
+        batch = list(pks[:batch_size])
+        if not batch:
+            break
+        with transaction.atomic(using=queryset.db):
+            # The objects may have been restored since the batch was
+            # selected, so they're selected again, and locked.
+            locked = queryset.filter(pk__in=batch).select_for_update().values_list('pk', flat=True)
+            objs = model._base_manager.using(queryset.db).filter(pk__in=list(locked))
+            if archive_to is not None:
+                archive_to._base_manager.using(queryset.db).bulk_create(
+                    archive_to(**values) for values in objs.values(*archived))
+            deleted, per_model = objs.delete()
+        counts.update(per_model)
+        purged += per_model.get(model._meta.label, 0)
+        pks = pks.filter(pk__gt=batch[-1])
+        if progress is not None:
+            progress(purged, batch[-1])
+        if len(batch) < batch_size:
+            break
+        if sleep:
+            time.sleep(sleep)
+    return sum(counts.values()), dict(counts)
+
+
+class SoftDeletableQuerySetMixin(RestorableQuerySetMixin[ModelT]):
     """
     QuerySet for SoftDeletableModel. Instead of removing instance sets
     its ``is_removed`` field to True.
     """
 
-    def delete(self) -> tuple[int, dict[str, int]]:
+    def delete(self, cascade: bool = False) -> tuple[int, dict[str, int]]:
         """
         Soft delete objects from queryset (set their ``is_removed``
-        field to True)
+        field to True, and their ``removed_at`` field if they have one),
+        and with ``cascade``, the soft deletable objects related to them
+        through ``on_delete=CASCADE`` relations.
         """
-        model: type[ModelT] = self.model  # type: ignore[attr-defined]
-        number_of_deleted_objects = cast(QuerySet[ModelT], self).update(is_removed=True)
-        return number_of_deleted_objects, {model._meta.label: number_of_deleted_objects}
+        queryset = cast(QuerySet[ModelT], self)
+        removed_at = timezone.now()
+        counts: Counter[str] = Counter()
+        with transaction.atomic(using=queryset.db, savepoint=False):
+            if cascade:
+                _cascade_soft_delete(queryset, counts, removed_at)
+            counts[queryset.model._meta.label] += queryset.update(
+                **_get_soft_delete_values(queryset.model, removed_at))
+        return sum(counts.values()), dict(counts)
 
 
 class SoftDeletableQuerySet(SoftDeletableQuerySetMixin[ModelT], QuerySet[ModelT]):
     pass
 
 
-class SoftDeletableManagerMixin(Generic[ModelT]):
+class SoftDeletableManagerMixin(ChunkedManagerMixin[ModelT]):
     """
     Manager that limits the queryset by default to show only not removed
     instances of model.
@@ -424,6 +2185,107 @@ class SoftDeletableManager(SoftDeletableManagerMixin[ModelT], models.Manager[Mod
     pass
 
 
+class PurgeableQuerySet(RestorableQuerySetMixin[ModelT], QuerySet[ModelT]):
+    pass
+
+
+class PurgeableManagerMixin(Generic[ModelT]):
+    """
+    Manager of all objects of a SoftDeletableModel, which can restore or
+    purge those marked as removed.
+    """
+    _queryset_class = PurgeableQuerySet
+
+    def restore(self, cascade: bool = False) -> tuple[int, dict[str, int]]:
+        """
+        Restore the objects marked as removed; see
+        ``RestorableQuerySetMixin.restore()``.
+        """
+        return self.get_queryset().restore(cascade)  # type: ignore[attr-defined]
+
+    def purge_removed(
+        self,
+        older_than: datetime.datetime | datetime.timedelta | None = None,
+        date_field: str | None = None,
+        batch_size: int = 1000,
+        sleep: float = 0,
+        archive_to: type[models.Model] | None = None,
+        start_after: Any = None,
+        progress: Callable[[int, Any], object] | None = None,
+    ) -> tuple[int, dict[str, int]]:
+        """
+        Delete the objects marked as removed in batches; see
+        ``purge_removed()``.
+        """
+        return purge_removed(
+            self.get_queryset(),  # type: ignore[attr-defined]
+            older_than, date_field, batch_size, sleep, archive_to, start_after, progress,
+        )
+
+
+class PurgeableManager(PurgeableManagerMixin[ModelT], models.Manager[ModelT]):
+    pass
+
+
+# The temporary tables of joins no longer used by any query, by connection,
+# to be dropped by the next join on the connection, in the thread owning it.
+_unused_join_tables: weakref.WeakKeyDictionary[BaseDatabaseWrapper, list[str]] = \
+    weakref.WeakKeyDictionary()
+# The models joined to the temporary tables, by the model, column and field
+# they refer to.
+_join_models: dict[tuple[type[models.Model], str, str], type[models.Model]] = {}
+_join_models_lock = threading.Lock()
+
+
+class _JoinTable:
+    """
+    A temporary table of ``JoinQueryset.join()``, dropped once the queries
+    joining it are garbage collected.
+    """
+
+    def __init__(self, connection: BaseDatabaseWrapper, name: str):
+        self.name = name
+        weakref.finalize(self, _unused_join_tables.setdefault(connection, []).append, name)
+
+
+class _TempTableJoin(Join):
+    table: _JoinTable
+
+    def relabeled_clone(self, change_map: dict[str | None, str]) -> Join:
+        clone = super().relabeled_clone(change_map)
+        assert isinstance(clone, _TempTableJoin)
+        clone.table = self.table
+        return clone
+
+
+def _drop_join_table(connection: BaseDatabaseWrapper, name: str) -> None:
+    with connection.cursor() as cursor:
+        cursor.execute(f'DROP TABLE IF EXISTS {connection.ops.quote_name(name)}')
+
+
+def _get_join_model(model: type[models.Model], fk_column: str, to_field: str) -> type[models.Model]:
+    key = (model, fk_column, to_field)
+    with _join_models_lock:
+        if key not in _join_models:
+            class Meta:
+                managed = False
+                # The table is given to each join.
+                db_table = 'model_utils_join'
+
+            _join_models[key] = type(f'JoinTempModel{len(_join_models)}', (models.Model,), {
+                '__module__': __name__,
+                'Meta': Meta,
+                'temp_key': models.ForeignKey(
+                    model,
+                    on_delete=models.DO_NOTHING,
+                    db_column=fk_column,
+                    to_field=to_field,
+                    related_name='+',
+                ),
+            })
+        return _join_models[key]
+
+
 class JoinQueryset(models.QuerySet[Any]):
 
     def join(self, qs: QuerySet[Any] | None = None) -> QuerySet[Any]:
@@ -437,6 +2299,10 @@ class JoinQueryset(models.QuerySet[Any]):
 
         The model of a given queryset needs to contain a valid foreign key to
         the current queryset to perform a join. A new queryset is then created.
+
+        Each join creates its own temporary table on the database of the
+        queryset. The table is dropped when the transaction it was created in
+        is committed, or once the querysets using it are garbage collected.
         '''
         to_field = 'id'
 
@@ -464,40 +2330,36 @@ class JoinQueryset(models.QuerySet[Any]):
         else:
             fk_column = 'id'
             qs = self.only(fk_column)
-            new_qs = self.model._default_manager.all()
-
-        TABLE_NAME = 'temp_stuff'
-        query, params = qs.query.sql_with_params()
-        sql = '''
-            DROP TABLE IF EXISTS {table_name};
-            DROP INDEX IF EXISTS {table_name}_id;
-            CREATE TEMPORARY TABLE {table_name} AS {query};
-            CREATE INDEX {table_name}_{fk_column} ON {table_name} ({fk_column});
-        '''.format(table_name=TABLE_NAME, fk_column=fk_column, query=str(query))
-
+            new_qs = self.model._default_manager.db_manager(self.db).all()
+
+        db = new_qs.db
+        connection = connections[db]
+        table = _JoinTable(connection, f'temp_join_{uuid.uuid4().hex}')
+        qn = connection.ops.quote_name
+        query, params = qs.query.get_compiler(using=db).as_sql()
+        unused = _unused_join_tables.get(connection, [])
         with connection.cursor() as cursor:
-            cursor.execute(sql, params)
-
-        class TempModel(models.Model):
-            temp_key = models.ForeignKey(
-                self.model,
-                on_delete=models.DO_NOTHING,
-                db_column=fk_column,
-                to_field=to_field
-            )
-
-            class Meta:
-                managed = False
-                db_table = TABLE_NAME
-
-        conn = Join(
-            table_name=TempModel._meta.db_table,
+            while unused:
+                cursor.execute(f'DROP TABLE IF EXISTS {qn(unused.pop())}')
+            cursor.execute(f'CREATE TEMPORARY TABLE {qn(table.name)} AS {query}', params)
+            cursor.execute(
+                f'CREATE INDEX {qn(table.name + "_idx")} ON {qn(table.name)} ({qn(fk_column)})')
+        if connection.in_atomic_block:
+            transaction.on_commit(
+                partial(_drop_join_table, connection, table.name), using=db)
+
+        join_field = _get_join_model(
+            self.model, fk_column, to_field)._meta.get_field('temp_key').remote_field
+        assert isinstance(join_field, ForeignObjectRel)
+        conn = _TempTableJoin(
+            table_name=table.name,
             parent_alias=new_qs.query.get_initial_alias(),
             table_alias=None,
             join_type='INNER JOIN',
-            join_field=self.model.tempmodel_set.rel,
+            join_field=join_field,
             nullable=False
         )
+        conn.table = table
         new_qs.query.join(conn, reuse=None)
         return new_qs
 
@@ -1,10 +1,17 @@
 from __future__ import annotations
 
-from typing import Any, Literal, TypeVar, overload
+from collections import Counter
+from collections.abc import Sequence
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, ClassVar, Literal, TypeVar, overload
 
 from django.core.exceptions import ImproperlyConfigured
-from django.db import models
+from django.db import models, router, transaction
+from django.db.backends.utils import (  # type: ignore[attr-defined]
+    names_digest,
+)
 from django.db.models.functions import Now
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 from model_utils.fields import (
@@ -14,7 +21,14 @@ from model_utils.fields import (
     StatusField,
     UUIDField,
 )
-from model_utils.managers import QueryManager, SoftDeletableManager
+from model_utils.managers import (
+    PurgeableManager,
+    QueryManager,
+    SoftDeletableManager,
+    _cascade_soft_delete,
+    _has_removed_at,
+    paginate_by_keyset,
+)
 
 ModelT = TypeVar('ModelT', bound=models.Model, covariant=True)
 
@@ -42,6 +56,18 @@ class TimeStampedModel(models.Model):
 
         super().save(*args, **kwargs)
 
+    @classmethod
+    def changed_since(
+        cls: type[ModelT], cursor: str | None = None, limit: int = 100
+    ) -> tuple[list[ModelT], str | None]:
+        """
+        Return at most ``limit`` objects created or modified after the
+        position encoded in ``cursor``, ordered by ``modified``, and the
+        cursor to pass next time.
+        """
+        return paginate_by_keyset(
+            cls._default_manager.all(), ('modified',), cursor, limit, keep_cursor=True)
+
     class Meta:
         abstract = True
 
@@ -89,7 +115,8 @@ class StatusModel(models.Model):
 
 def add_status_query_managers(sender: type[models.Model], **kwargs: Any) -> None:
     """
-    Add a Querymanager for each status item dynamically.
+    Add a Querymanager for each status item dynamically, reading from the
+    ``STATUS_READ_FROM`` database alias of the model if it has one.
 
     """
     if not issubclass(sender, StatusModel):
@@ -98,6 +125,8 @@ def add_status_query_managers(sender: type[models.Model], **kwargs: Any) -> None
     default_manager = sender._meta.default_manager
     assert default_manager is not None
 
+    read_from = getattr(sender, 'STATUS_READ_FROM', None)
+    pin_seconds = getattr(sender, 'STATUS_READ_PIN_SECONDS', 0)
     for value, display in getattr(sender, 'STATUS', ()):
         if _field_exists(sender, value):
             raise ImproperlyConfigured(
@@ -105,7 +134,10 @@ def add_status_query_managers(sender: type[models.Model], **kwargs: Any) -> None
                 "conflicts with a status of the same name."
                 % (sender.__name__, value)
             )
-        sender.add_to_class(value, QueryManager(status=value))
+        manager: QueryManager[Any] = QueryManager(status=value)
+        if read_from is not None:
+            manager = manager.read_from(read_from, pin_seconds)
+        sender.add_to_class(value, manager)
 
     sender._meta.default_manager_name = default_manager.name
 
@@ -143,22 +175,33 @@ class SoftDeletableModel(models.Model):
     marks entries that are not going to be used anymore, but are
     kept in db for any reason.
     Default manager returns only not-removed entries.
+
+    With ``RECORD_REMOVED_AT``, a ``removed_at`` field records when entries
+    were removed. ``AVAILABLE_INDEXES`` lists the fields of partial indexes
+    covering only the entries that are not removed.
     """
     is_removed = models.BooleanField(default=False)
 
+    RECORD_REMOVED_AT: ClassVar[bool] = False
+    AVAILABLE_INDEXES: ClassVar[Sequence[Sequence[str]]] = ()
+
+    if TYPE_CHECKING:
+        removed_at: datetime | None
+
     class Meta:
         abstract = True
 
-    objects: models.Manager[SoftDeletableModel] = SoftDeletableManager(_emit_deprecation_warnings=True)
-    available_objects: models.Manager[SoftDeletableModel] = SoftDeletableManager()
-    all_objects = models.Manager()
+    objects: SoftDeletableManager[SoftDeletableModel] = SoftDeletableManager(_emit_deprecation_warnings=True)
+    available_objects: SoftDeletableManager[SoftDeletableModel] = SoftDeletableManager()
+    all_objects = PurgeableManager()
 
     # Note that soft delete does not return anything,
     # which doesn't conform to Django's interface.
     # https://github.com/jazzband/django-model-utils/issues/541
     @overload  # type: ignore[override]
     def delete(
-        self, using: Any = None, *args: Any, soft: Literal[True] = True, **kwargs: Any
+        self, using: Any = None, *args: Any, soft: Literal[True] = True,
+        cascade: bool = False, **kwargs: Any
     ) -> None:
         ...
 
@@ -169,20 +212,76 @@ class SoftDeletableModel(models.Model):
         ...
 
     def delete(
-        self, using: Any = None, *args: Any, soft: bool = True, **kwargs: Any
+        self, using: Any = None, *args: Any, soft: bool = True, cascade: bool = False,
+        **kwargs: Any
     ) -> tuple[int, dict[str, int]] | None:
         """
-        Soft delete object (set its ``is_removed`` field to True).
+        Soft delete object (set its ``is_removed`` field to True), and with
+        ``cascade``, the soft deletable objects related to it through
+        ``on_delete=CASCADE`` relations.
         Actually delete object if setting ``soft`` to False.
         """
         if soft:
-            self.is_removed = True
-            self.save(using=using)
+            using = using or router.db_for_write(self.__class__, instance=self)
+            removed_at = timezone.now()
+            with transaction.atomic(using=using, savepoint=False):
+                if cascade:
+                    _cascade_soft_delete(
+                        self.__class__._base_manager.using(using).filter(pk=self.pk),
+                        Counter(), removed_at)
+                self.is_removed = True
+                if _has_removed_at(self.__class__):
+                    self.removed_at = removed_at
+                self.save(using=using)
             return None
         else:
             return super().delete(using, *args, **kwargs)
 
 
+def _add_soft_deletable_index(
+    model: type[models.Model], fields: Sequence[str], condition: models.Q, suffix: str
+) -> None:
+    db_table = model._meta.db_table
+    digest = names_digest(db_table, suffix, *fields, length=6)
+    model._meta.indexes = [
+        *model._meta.indexes,
+        models.Index(
+            fields=list(fields), condition=condition,
+            name=f"{db_table[:11]}_{fields[0].lstrip('-')[:7]}_{digest}_{suffix}",
+        ),
+    ]
+    # Migrations only include the indexes of models declaring some.
+    model._meta.original_attrs['indexes'] = model._meta.indexes
+
+
+def prepare_soft_deletable_model(sender: type[models.Model], **kwargs: Any) -> None:
+    """
+    Add the ``removed_at`` field and the partial indexes a SoftDeletableModel
+    asks for.
+
+    """
+    if (
+        not issubclass(sender, SoftDeletableModel)
+        or sender._meta.abstract
+        or sender._meta.proxy
+        # the fields belong to the table of a parent
+        or not _field_exists(sender, 'is_removed')
+    ):
+        return
+    if sender.RECORD_REMOVED_AT:
+        if not _field_exists(sender, 'removed_at'):
+            sender.add_to_class('removed_at', models.DateTimeField(
+                _('removed at'), null=True, blank=True, editable=False))
+        # Purges select the oldest removed entries.
+        _add_soft_deletable_index(
+            sender, ['removed_at'], models.Q(is_removed=True), 'rm')
+    for fields in sender.AVAILABLE_INDEXES:
+        _add_soft_deletable_index(sender, fields, models.Q(is_removed=False), 'av')
+
+
+models.signals.class_prepared.connect(prepare_soft_deletable_model)
+
+
 class UUIDModel(models.Model):
     """
     This abstract base class provides id field on any model that inherits from it
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from typing import Any
+
+from django.db import DEFAULT_DB_ALIAS, models
+
+from model_utils.managers import get_read_db, read_replicas
+
+
+class ReadReplicaRouter:
+    """
+    Route the reads of ``QueryManager.read_from()`` managers to their
+    replicas, and the writes of the objects read from replicas to the
+    primary database. Replicas are left out of migrations, which reach them
+    through replication.
+
+    Add it to ``DATABASE_ROUTERS``, before any router routing the same
+    models; set ``primary`` in a subclass if it isn't the default database.
+    """
+
+    primary = DEFAULT_DB_ALIAS
+
+    def db_for_read(self, model: type[models.Model], **hints: Any) -> str | None:
+        read_from = hints.get('read_from')
+        if read_from is None:
+            return None
+        alias, pin_seconds = read_from
+        return get_read_db(model, alias, self.primary, pin_seconds)
+
+    def db_for_write(self, model: type[models.Model], **hints: Any) -> str | None:
+        instance = hints.get('instance')
+        if instance is not None and instance._state.db in read_replicas:
+            return self.primary
+        return None
+
+    def allow_relation(self, obj1: models.Model, obj2: models.Model, **hints: Any) -> bool | None:
+        databases = {self.primary, *read_replicas}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db: str, app_label: str, **hints: Any) -> bool | None:
+        if db in read_replicas:
+            return False
+        return None
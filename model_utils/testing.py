@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import re
+from contextlib import contextmanager
+from typing import TYPE_CHECKING
+
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test.utils import CaptureQueriesContext
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+# String literals and quoted identifiers, so that their contents aren't
+# mistaken for SQL keywords, then the tokens the shape is derived from.
+_TOKEN_RE = re.compile(r"""'(?:[^']|'')*'|"(?:[^"]|"")*"|`[^`]*`|[(),]|\w+""")
+
+
+def _count_joins(sql: str) -> int:
+    return sum(1 for token in _TOKEN_RE.findall(sql) if token.upper() == 'JOIN')
+
+
+def _count_selected_columns(sql: str) -> int:
+    """
+    Count the columns selected by the outermost (or first) SELECT of a
+    query, or return 0 if it isn't one.
+    """
+    depth = 0
+    select_depth: int | None = None
+    columns = 0
+    for token in _TOKEN_RE.findall(sql):
+        if token == '(':
+            depth += 1
+        elif token == ')':
+            depth -= 1
+        elif select_depth is None:
+            if token.upper() == 'SELECT':
+                select_depth = depth
+                columns = 1
+        elif depth == select_depth:
+            if token == ',':
+                columns += 1
+            elif token.upper() == 'FROM':
+                break
+    return columns
+
+
+class InheritanceQueryRecorder(CaptureQueriesContext):
+    """
+    Record the SQL run on a database connection, like Django's
+    ``CaptureQueriesContext``, and report the shape of the queries: how many
+    tables each of them joins and how many columns it selects.
+    """
+
+    def __init__(self, using: str = DEFAULT_DB_ALIAS):
+        super().__init__(connections[using])
+
+    @property
+    def num_queries(self) -> int:
+        return len(self)
+
+    @property
+    def joins(self) -> list[int]:
+        return [_count_joins(query['sql']) for query in self.captured_queries]
+
+    @property
+    def columns(self) -> list[int]:
+        return [_count_selected_columns(query['sql']) for query in self.captured_queries]
+
+    @property
+    def max_joins(self) -> int:
+        return max(self.joins, default=0)
+
+    @property
+    def max_columns(self) -> int:
+        return max(self.columns, default=0)
+
+    def report(self) -> str:
+        return '\n'.join(
+            f'{index}. joins={joins} columns={columns}: {query["sql"]}'
+            for index, (query, joins, columns) in enumerate(
+                zip(self.captured_queries, self.joins, self.columns), start=1)
+        )
+
+
+@contextmanager
+def assert_inheritance_query_budget(
+    *,
+    max_queries: int | None = None,
+    max_joins: int | None = None,
+    max_columns: int | None = None,
+    using: str = DEFAULT_DB_ALIAS,
+) -> Iterator[InheritanceQueryRecorder]:
+    """
+    Fail if the code in the block runs more than ``max_queries`` queries, or
+    any query joining more than ``max_joins`` tables or selecting more than
+    ``max_columns`` columns.
+    """
+    with InheritanceQueryRecorder(using) as recorder:
+        yield recorder
+
+    exceeded = [
+        f'{description} {actual} > {budget}'
+        for description, actual, budget in (
+            ('queries', recorder.num_queries, max_queries),
+            ('joins', recorder.max_joins, max_joins),
+            ('columns', recorder.max_columns, max_columns),
+        )
+        if budget is not None and actual > budget
+    ]
+    if exceeded:
+        raise AssertionError(
+            'Query budget exceeded ({}):\n{}'.format(', '.join(exceeded), recorder.report()))
+
+
+try:
+    import pytest
+except ImportError:  # pragma: no cover
+    pass
+else:
+    @pytest.fixture
+    def inheritance_queries(db: None) -> Iterator[InheritanceQueryRecorder]:
+        """
+        Record the queries of the default database during a test.
+        """
+        with InheritanceQueryRecorder() as recorder:
+            yield recorder
+
+    @pytest.fixture
+    def inheritance_query_budget(db: None) -> object:
+        """
+        Give ``assert_inheritance_query_budget``, for use as a context
+        manager within a test.
+        """
+        return assert_inheritance_query_budget
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from typing import Any, ClassVar, Iterable, TypeVar, overload
 
+from django.core.cache import caches
 from django.db import models
 from django.db.models import Manager
 from django.db.models.query import QuerySet
@@ -9,10 +10,12 @@ from django.db.models.query_utils import DeferredAttribute
 from django.utils.translation import gettext_lazy as _
 
 from model_utils import Choices
+from model_utils.cache import LRUCache
 from model_utils.fields import MonitorField, SplitField, StatusField, UUIDField
 from model_utils.managers import (
     InheritanceManager,
     JoinQueryset,
+    PurgeableManager,
     QueryManager,
     SoftDeletableManager,
     SoftDeletableQuerySet,
@@ -29,11 +32,17 @@ from tests.fields import MutableField
 
 ModelT = TypeVar('ModelT', bound=models.Model, covariant=True)
 
+inheritance_subclass_cache = LRUCache(maxsize=100)
+
 
 class InheritanceManagerTestRelated(models.Model):
     pass
 
 
+class InheritanceManagerTestTag(models.Model):
+    name = models.CharField(max_length=20)
+
+
 class InheritanceManagerTestParent(models.Model):
     # FileField is just a handy descriptor-using field. Refs #6.
     non_related_field_using_descriptor = models.FileField(upload_to="test")
@@ -45,6 +54,8 @@ class InheritanceManagerTestParent(models.Model):
         "self", related_name="imtests_self", null=True,
         on_delete=models.CASCADE)
     objects: ClassVar[InheritanceManager[InheritanceManagerTestParent]] = InheritanceManager()
+    cached_objects: ClassVar[InheritanceManager[InheritanceManagerTestParent]] = \
+        InheritanceManager(subclass_cache=inheritance_subclass_cache)
 
     def __str__(self) -> str:
         return "{}({})".format(
@@ -56,6 +67,7 @@ class InheritanceManagerTestParent(models.Model):
 class InheritanceManagerTestChild1(InheritanceManagerTestParent):
     non_related_field_using_descriptor_2 = models.FileField(upload_to="test")
     normal_field_2 = models.TextField()
+    tags = models.ManyToManyField(InheritanceManagerTestTag, related_name="child1s")
     objects: ClassVar[InheritanceManager[InheritanceManagerTestParent]] = InheritanceManager()
 
 
@@ -95,6 +107,30 @@ class InheritanceManagerTestChild4(InheritanceManagerTestParent):
         parent_link=True, on_delete=models.CASCADE)
 
 
+class InheritanceManagerTestPlace(models.Model):
+    name = models.CharField(max_length=50)
+
+    objects: ClassVar[InheritanceManager[InheritanceManagerTestPlace]] = InheritanceManager()
+
+
+class InheritanceManagerTestRestaurant(InheritanceManagerTestPlace):
+    serves_pizza = models.BooleanField(default=False)
+
+
+class InheritanceManagerTestPizzeria(InheritanceManagerTestRestaurant):
+    oven_count = models.PositiveSmallIntegerField(default=1)
+
+
+class InheritanceManagerTestBar(InheritanceManagerTestPlace):
+    pass
+
+
+class InheritanceManagerTestMenuItem(models.Model):
+    restaurant = models.ForeignKey(
+        InheritanceManagerTestRestaurant, related_name='menu_items',
+        on_delete=models.CASCADE)
+
+
 class TimeStamp(TimeStampedModel):
     test_field = models.PositiveSmallIntegerField(default=0)
 
@@ -178,6 +214,12 @@ class CustomManagerStatusModel(AbstractCustomManagerStatusModel):
     title = models.CharField(max_length=50)
 
 
+class StatusReadFromReplica(StatusModel):
+    STATUS = Choices('active', 'on_hold')
+    STATUS_READ_FROM = 'replica'
+    STATUS_READ_PIN_SECONDS = 5
+
+
 class Post(models.Model):
     published = models.BooleanField(default=False)
     confirmed = models.BooleanField(default=False)
@@ -189,11 +231,41 @@ class Post(models.Model):
         models.Q(published=True) & models.Q(confirmed=True))
     public_reversed: ClassVar[QueryManager[Post]] = QueryManager(
         published=True).order_by("-order")
+    public_indexed: ClassVar[QueryManager[Post]] = QueryManager(
+        published=True).order_by("-order").indexed()
+    confirmed_indexed: ClassVar[QueryManager[Post]] = QueryManager(
+        confirmed=True).indexed(name='post_confirmed_idx', fields=['published'])
+    public_replica: ClassVar[QueryManager[Post]] = QueryManager(
+        published=True).read_from('replica')
+    public_pinned: ClassVar[QueryManager[Post]] = QueryManager(
+        published=True).read_from('replica', pin_seconds=5)
 
     class Meta:
         ordering = ("order",)
 
 
+class PostComment(models.Model):
+    post = models.ForeignKey(Post, on_delete=models.CASCADE)
+
+
+class CachedPost(models.Model):
+    published = models.BooleanField(default=False)
+    title = models.CharField(max_length=50, default='')
+    order = models.IntegerField(default=0)
+
+    tracker = FieldTracker(fields=['published'])
+
+    objects = models.Manager()
+    public: ClassVar[QueryManager[CachedPost]] = QueryManager(
+        published=True).order_by('order').cached()
+    public_pks: ClassVar[QueryManager[CachedPost]] = QueryManager(
+        published=True).order_by('order').cached(pks_only=True)
+    positive_pks: ClassVar[QueryManager[CachedPost]] = QueryManager(
+        order__gt=0).cached(pks_only=True)
+    public_shared: ClassVar[QueryManager[CachedPost]] = QueryManager(
+        published=True).cached(timeout=60, backend=caches['default'])
+
+
 class Article(models.Model):
     title = models.CharField(max_length=50)
     body = SplitField()
@@ -375,7 +447,42 @@ class SoftDeletable(SoftDeletableModel):
     """
     name = models.CharField(max_length=20)
 
-    all_objects: ClassVar[Manager[SoftDeletable]] = models.Manager()
+    RECORD_REMOVED_AT = True
+    AVAILABLE_INDEXES = [['name']]
+
+    all_objects: ClassVar[PurgeableManager[SoftDeletable]] = PurgeableManager()
+
+
+class SoftDeletableArchive(models.Model):
+    id = models.IntegerField(primary_key=True)
+    name = models.CharField(max_length=20)
+
+
+class SoftDeletableTimeStamped(TimeStampedModel, SoftDeletableModel):
+    pass
+
+
+class SoftDeletableChild(SoftDeletableModel):
+    RECORD_REMOVED_AT = True
+
+    parent = models.ForeignKey(SoftDeletable, on_delete=models.CASCADE, related_name='children')
+    # soft deleting the other object leaves the child alone
+    other = models.ForeignKey(
+        SoftDeletable, on_delete=models.SET_NULL, null=True, related_name='others')
+
+
+class SoftDeletableGrandchild(SoftDeletableModel):
+    RECORD_REMOVED_AT = True
+
+    parent = models.ForeignKey(
+        SoftDeletableChild, on_delete=models.CASCADE, related_name='children')
+
+
+class SoftDeletableNode(SoftDeletableModel):
+    RECORD_REMOVED_AT = True
+
+    parent = models.ForeignKey(
+        'self', on_delete=models.CASCADE, null=True, related_name='children')
 
 
 class CustomSoftDeleteQuerySet(SoftDeletableQuerySet[ModelT]):
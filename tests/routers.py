@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from typing import Any
+
+from django.db import models
+
+
+class ReadWriteSplitRouter:
+    """
+    Read every model from the replica and write it to the default database.
+    """
+
+    def db_for_read(self, model: type[models.Model], **hints: Any) -> str:
+        return 'replica'
+
+    def db_for_write(self, model: type[models.Model], **hints: Any) -> str:
+        return 'default'
+
+    def allow_relation(self, obj1: models.Model, obj2: models.Model, **hints: Any) -> bool:
+        return True
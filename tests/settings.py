@@ -1,10 +1,13 @@
 import os
+from typing import Any
 
 INSTALLED_APPS = (
     'model_utils',
     'tests',
 )
 
+DATABASES: dict[str, dict[str, Any]]
+
 if os.environ.get('SQLITE'):
     DATABASES = {
         'default': {
@@ -22,6 +25,8 @@ else:
             "PORT": os.environ.get("POSTGRES_PORT", "5432")
         },
     }
+DATABASES['replica'] = {**DATABASES['default'], 'TEST': {'MIRROR': 'default'}}
+DATABASE_ROUTERS = ['model_utils.routers.ReadReplicaRouter']
 SECRET_KEY = 'dummy'
 
 CACHES = {
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import pickle
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from model_utils.cache import LRUCache
+
+
+class LRUCacheTests(SimpleTestCase):
+    def test_get_set_delete(self) -> None:
+        cache = LRUCache()
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.get('a', 'default'), 'default')
+        cache.set('a', 1)
+        self.assertEqual(cache.get('a'), 1)
+        cache.delete('a')
+        cache.delete('a')
+        self.assertIsNone(cache.get('a'))
+
+    def test_evicts_least_recently_used(self) -> None:
+        cache = LRUCache(maxsize=2)
+        cache.set_many({'a': 1, 'b': 2})
+        cache.get('a')
+        cache.set('c', 3)
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), 1)
+        self.assertEqual(cache.get('c'), 3)
+
+    def test_clear(self) -> None:
+        cache = LRUCache()
+        cache.set('a', 1)
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+
+    def test_timeout(self) -> None:
+        cache = LRUCache()
+        with mock.patch('model_utils.cache.time.monotonic', return_value=100.0):
+            cache.set('a', 1, timeout=10)
+            cache.set_many({'b': 2})
+        with mock.patch('model_utils.cache.time.monotonic', return_value=109.0):
+            self.assertEqual(cache.get('a'), 1)
+        with mock.patch('model_utils.cache.time.monotonic', return_value=110.0):
+            self.assertIsNone(cache.get('a'))
+            self.assertEqual(cache.get('b'), 2)
+        self.assertEqual(len(cache), 1)
+
+    def test_invalid_maxsize(self) -> None:
+        with self.assertRaises(ValueError):
+            LRUCache(maxsize=0)
+
+    def test_pickle(self) -> None:
+        cache = LRUCache(maxsize=5)
+        cache.set('a', 1)
+        unpickled = pickle.loads(pickle.dumps(cache))
+        self.assertEqual(unpickled.maxsize, 5)
+        self.assertIsNone(unpickled.get('a'))
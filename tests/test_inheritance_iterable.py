@@ -1,9 +1,19 @@
 from __future__ import annotations
 
+from unittest import mock
+
+from django.db import connection, models
 from django.db.models import Prefetch
 from django.test import TestCase
 
-from tests.models import InheritanceManagerTestChild1, InheritanceManagerTestParent
+from model_utils.managers import InheritanceQuerySet
+from tests.models import (
+    InheritanceManagerTestChild1,
+    InheritanceManagerTestChild2,
+    InheritanceManagerTestGrandChild1,
+    InheritanceManagerTestParent,
+    InheritanceManagerTestRelated,
+)
 
 
 class InheritanceIterableTest(TestCase):
@@ -16,3 +26,80 @@ class InheritanceIterableTest(TestCase):
             )
         )
         self.assertEqual(qs.count(), 0)
+
+
+class InheritanceIteratorTests(TestCase):
+    """
+    ``select_subclasses().iterator()`` streams rows instead of caching
+    the whole result set.
+    """
+
+    def setUp(self) -> None:
+        self.related = InheritanceManagerTestRelated.objects.create()
+        self.objs = [
+            InheritanceManagerTestParent.objects.create(related=self.related),
+            InheritanceManagerTestChild1.objects.create(related=self.related),
+            InheritanceManagerTestChild2.objects.create(related=self.related),
+            InheritanceManagerTestGrandChild1.objects.create(related=self.related),
+            InheritanceManagerTestChild1.objects.create(related=self.related),
+        ]
+
+    def test_iterator_selects_subclasses(self) -> None:
+        qs = InheritanceManagerTestParent.objects.select_subclasses().order_by('pk')
+        results = list(qs.iterator(chunk_size=2))
+        self.assertEqual(results, self.objs)
+        self.assertEqual(
+            [type(obj) for obj in results],
+            [type(obj) for obj in self.objs],
+        )
+
+    def test_iterator_does_not_cache_results(self) -> None:
+        qs = InheritanceManagerTestParent.objects.select_subclasses()
+        for _ in qs.iterator(chunk_size=2):
+            pass
+        self.assertIsNone(qs._result_cache)
+
+    def test_iterator_resolves_subclasses_lazily(self) -> None:
+        qs = InheritanceManagerTestParent.objects.select_subclasses().order_by('pk')
+        with mock.patch.object(
+            InheritanceQuerySet, '_get_sub_obj_recurse', autospec=True,
+            side_effect=InheritanceQuerySet._get_sub_obj_recurse,
+        ) as get_sub_obj:
+            iterator = qs.iterator(chunk_size=2)
+            first = next(iterator)
+            resolved = {call.args[1].pk for call in get_sub_obj.call_args_list}
+            self.assertEqual(resolved, {first.pk})
+            list(iterator)
+
+    def test_iterator_copies_annotations_and_extras(self) -> None:
+        qs = (
+            InheritanceManagerTestParent.objects.select_subclasses()
+            .annotate(related_count=models.Count('related'))
+            .extra(select={'foo': 'id + 1'})
+        )
+        results = list(qs.iterator(chunk_size=2))
+        self.assertEqual(len(results), len(self.objs))
+        for obj in results:
+            self.assertEqual(obj.related_count, 1)
+            self.assertEqual(obj.foo, obj.pk + 1)
+
+    def test_iterator_prefetches_per_chunk(self) -> None:
+        qs = (
+            InheritanceManagerTestParent.objects.select_subclasses()
+            .prefetch_related('related')
+        )
+        # One query for the rows and one prefetch per chunk of two.
+        with self.assertNumQueries(4):
+            results = list(qs.iterator(chunk_size=2))
+        self.assertEqual(len(results), len(self.objs))
+        with self.assertNumQueries(0):
+            for obj in results:
+                self.assertEqual(obj.related, self.related)
+
+    def test_iterator_uses_chunked_cursor(self) -> None:
+        qs = InheritanceManagerTestParent.objects.select_subclasses()
+        with mock.patch.object(
+            connection, 'chunked_cursor', side_effect=connection.chunked_cursor
+        ) as chunked_cursor:
+            list(qs.iterator(chunk_size=2))
+        chunked_cursor.assert_called_once()
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import concurrent.futures
+import pickle
+import threading
+
+from django.db import connection
+from django.db.models import QuerySet
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+
+from model_utils.managers import _process_chunk, chunk_queryset
+from tests.models import Post, SoftDeletable, Status
+
+
+def _orders(queryset: QuerySet[Post]) -> list[int]:
+    return sorted(queryset.values_list('order', flat=True))
+
+
+class ChunkedTests(TestCase):
+    def setUp(self) -> None:
+        for order in range(10):
+            Post.objects.create(published=order % 3 != 0, order=order)
+
+    def test_chunks(self) -> None:
+        chunks = list(Post.public.chunked(3))
+        self.assertEqual([_orders(chunk) for chunk in chunks], [[1, 2, 4], [5, 7, 8]])
+
+    def test_chunks_uneven(self) -> None:
+        chunks = list(Post.public.chunked(4))
+        self.assertEqual([_orders(chunk) for chunk in chunks], [[1, 2, 4, 5], [7, 8]])
+
+    def test_single_chunk(self) -> None:
+        chunks = list(Post.public.chunked(100))
+        self.assertEqual([_orders(chunk) for chunk in chunks], [[1, 2, 4, 5, 7, 8]])
+
+    def test_no_chunks(self) -> None:
+        Post.objects.all().delete()
+        self.assertEqual(list(Post.public.chunked(3)), [])
+
+    def test_queries(self) -> None:
+        chunks = chunk_queryset(Post.objects.all(), 3)
+        with self.assertNumQueries(2):
+            next(chunks)
+        # the end of each chunk is sought past the previous one
+        for _ in range(2):
+            with CaptureQueriesContext(connection) as queries:
+                next(chunks)
+            self.assertEqual(len(queries), 1)
+            self.assertIn('OFFSET 2', queries[0]['sql'])
+        # the last seek finds the end of the objects
+        with self.assertNumQueries(2):
+            self.assertEqual(_orders(next(chunks)), [9])
+
+    def test_objects_created_later_left_out(self) -> None:
+        chunks = Post.public.chunked(4)
+        next(chunks)
+        Post.objects.create(published=True, order=10)
+        self.assertEqual([_orders(chunk) for chunk in chunks], [[7, 8]])
+
+    def test_soft_deletable_manager(self) -> None:
+        for name in 'abcde':
+            SoftDeletable.available_objects.create(name=name, is_removed=name == 'c')  # type: ignore[misc]
+        chunks = list(SoftDeletable.available_objects.chunked(2))
+        self.assertEqual(
+            [sorted(chunk.values_list('name', flat=True)) for chunk in chunks],  # type: ignore[misc]
+            [['a', 'b'], ['d', 'e']],
+        )
+
+    def test_status_manager(self) -> None:
+        for _ in range(3):
+            Status.objects.create(status=Status.STATUS.active)
+        self.assertEqual([chunk.count() for chunk in Status.active.chunked(2)], [2, 1])
+
+    def test_invalid_size(self) -> None:
+        with self.assertRaises(ValueError):
+            list(Post.public.chunked(0))
+
+
+def _count_in_thread(queryset: QuerySet[Post]) -> tuple[int, int]:
+    return queryset.count(), threading.get_ident()
+
+
+class ProcessInParallelTests(TransactionTestCase):
+    def setUp(self) -> None:
+        for order in range(10):
+            Post.objects.create(published=order % 3 != 0, order=order)
+
+    def test_threads(self) -> None:
+        results = Post.public.process_in_parallel(_count_in_thread, workers=2, chunk_size=4)
+        self.assertEqual([count for count, thread in results], [4, 2])
+        self.assertNotIn(threading.get_ident(), [thread for count, thread in results])
+
+    def test_errors_raised(self) -> None:
+        def fail(queryset: QuerySet[Post]) -> None:
+            raise ZeroDivisionError
+
+        with self.assertRaises(ZeroDivisionError):
+            Post.public.process_in_parallel(fail, chunk_size=4)
+
+    def test_chunk_query_can_be_pickled(self) -> None:
+        chunk = next(Post.public.chunked(3))
+        query = pickle.loads(pickle.dumps(chunk.query))
+        # _process_chunk closes the connections of the thread it runs in.
+        with concurrent.futures.ThreadPoolExecutor(1) as executor:
+            future = executor.submit(_process_chunk, _orders, type(chunk), Post, query, 'default')
+        self.assertEqual(future.result(), [1, 2, 4])
@@ -1,13 +1,25 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, cast
 from unittest import mock
 
-from django.db import connection, models
-from django.test import TestCase
-
-from model_utils.managers import InheritanceManager
+from django.core.exceptions import FieldDoesNotExist
+from django.db import NotSupportedError, connection, models
+from django.db.models.constants import LOOKUP_SEP
+from django.db.models.signals import pre_delete
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext, override_settings
+
+from model_utils.managers import (
+    InheritanceIdentityMap,
+    InheritanceManager,
+    InheritanceQuerySet,
+)
 from tests.models import (
+    InheritanceManagerTestBar,
     InheritanceManagerTestChild1,
     InheritanceManagerTestChild2,
     InheritanceManagerTestChild3,
@@ -15,9 +27,15 @@ from tests.models import (
     InheritanceManagerTestChild4,
     InheritanceManagerTestGrandChild1,
     InheritanceManagerTestGrandChild1_2,
+    InheritanceManagerTestMenuItem,
     InheritanceManagerTestParent,
+    InheritanceManagerTestPizzeria,
+    InheritanceManagerTestPlace,
     InheritanceManagerTestRelated,
+    InheritanceManagerTestRestaurant,
+    InheritanceManagerTestTag,
     TimeFrame,
+    inheritance_subclass_cache,
 )
 
 if TYPE_CHECKING:
@@ -577,3 +595,845 @@ class InheritanceManagerRelatedTests(InheritanceManagerTests):
     def test_clone_when_inheritance_queryset_selects_subclasses_should_clone_them_too(self) -> None:
         qs = InheritanceManagerTestParent.objects.select_subclasses()
         self.assertEqual(qs.subclasses, qs._clone().subclasses)
+
+
+class InheritanceManagerSubclassCountsTests(TestCase):
+    def setUp(self) -> None:
+        InheritanceManagerTestParent.objects.create()
+        InheritanceManagerTestChild1.objects.create(normal_field='x')
+        InheritanceManagerTestChild1.objects.create()
+        InheritanceManagerTestChild2.objects.create()
+        InheritanceManagerTestGrandChild1.objects.create(normal_field='x')
+
+    def test_subclass_counts(self) -> None:
+        with self.assertNumQueries(1):
+            counts = InheritanceManagerTestParent.objects.subclass_counts()
+        self.assertEqual(counts, {
+            InheritanceManagerTestParent: 1,
+            InheritanceManagerTestChild1: 2,
+            InheritanceManagerTestChild2: 1,
+            InheritanceManagerTestChild3: 0,
+            InheritanceManagerTestChild3_1: 0,
+            InheritanceManagerTestChild4: 0,
+            InheritanceManagerTestGrandChild1: 1,
+            InheritanceManagerTestGrandChild1_2: 0,
+        })
+
+    def test_subclass_counts_respects_filters(self) -> None:
+        counts = InheritanceManagerTestParent.objects.filter(
+            normal_field='x').subclass_counts()
+        self.assertEqual(counts[InheritanceManagerTestChild1], 1)
+        self.assertEqual(counts[InheritanceManagerTestGrandChild1], 1)
+        self.assertEqual(sum(counts.values()), 2)
+
+    def test_subclass_counts_of_selected_subclasses(self) -> None:
+        counts = InheritanceManagerTestParent.objects.select_subclasses(
+            InheritanceManagerTestChild1).subclass_counts()
+        self.assertEqual(counts, {
+            InheritanceManagerTestParent: 2,
+            InheritanceManagerTestChild1: 3,
+        })
+
+    def test_subclass_counts_ignores_ordering(self) -> None:
+        counts = InheritanceManagerTestParent.objects.order_by(
+            'pk').select_subclasses().subclass_counts()
+        self.assertEqual(sum(counts.values()), 5)
+
+
+class InheritanceManagerPrefetchSubclassRelatedTests(TestCase):
+    def setUp(self) -> None:
+        self.tag = InheritanceManagerTestTag.objects.create(name='a')
+        self.parent = InheritanceManagerTestParent.objects.create()
+        self.child1 = InheritanceManagerTestChild1.objects.create()
+        self.child1.tags.add(self.tag)  # type: ignore[attr-defined]
+        self.grandchild1 = InheritanceManagerTestGrandChild1.objects.create()
+        self.grandchild1.tags.add(self.tag)  # type: ignore[attr-defined]
+        self.child4 = InheritanceManagerTestChild4.objects.create(  # type: ignore[misc]
+            other_onetoone=self.parent)
+        self.child2 = InheritanceManagerTestChild2.objects.create()
+
+    def get_queryset(self) -> InheritanceQuerySet[InheritanceManagerTestParent]:
+        return InheritanceManagerTestParent.objects.select_subclasses().prefetch_subclass_related({
+            InheritanceManagerTestChild1: ['tags'],
+            InheritanceManagerTestChild4: ['other_onetoone'],
+        }).order_by('pk')
+
+    def test_prefetch_per_subclass(self) -> None:
+        # One query for the objects and one per (subclass, lookup).
+        with self.assertNumQueries(3):
+            results = list(self.get_queryset())
+        self.assertEqual(
+            results,
+            [self.parent, self.child1, self.grandchild1, self.child4, self.child2],
+        )
+        with self.assertNumQueries(0):
+            child1 = cast(InheritanceManagerTestChild1, results[1])
+            grandchild1 = cast(InheritanceManagerTestGrandChild1, results[2])
+            child4 = cast(InheritanceManagerTestChild4, results[3])
+            self.assertEqual(list(child1.tags.all()), [self.tag])
+            self.assertEqual(list(grandchild1.tags.all()), [self.tag])
+            self.assertEqual(child4.other_onetoone, self.parent)
+
+    def test_prefetch_skips_subclasses_without_results(self) -> None:
+        with self.assertNumQueries(1):
+            list(self.get_queryset().filter(pk=self.child2.pk))
+
+    def test_prefetch_with_iterator(self) -> None:
+        # The objects, then one prefetch batch per subclass present in
+        # each chunk: Child1 in the first chunk, Child4 in the second.
+        with self.assertNumQueries(3):
+            results = list(self.get_queryset().iterator(chunk_size=3))
+        with self.assertNumQueries(0):
+            child4 = cast(InheritanceManagerTestChild4, results[3])
+            self.assertEqual(child4.other_onetoone, self.parent)
+
+    def test_iterator_requires_chunk_size(self) -> None:
+        with self.assertRaisesRegex(ValueError, 'chunk_size must be provided'):
+            self.get_queryset().iterator()
+
+    def test_lookups_are_chained(self) -> None:
+        qs = InheritanceManagerTestParent.objects.prefetch_subclass_related(
+            {InheritanceManagerTestChild1: ['tags']}
+        ).prefetch_subclass_related(
+            {InheritanceManagerTestChild1: ['related']}
+        )
+        self.assertEqual(
+            qs._subclass_prefetch_lookups,
+            {InheritanceManagerTestChild1: ('tags', 'related')},
+        )
+        self.assertEqual(qs.prefetch_subclass_related(None)._subclass_prefetch_lookups, {})
+
+    def test_invalid_subclass(self) -> None:
+        with self.assertRaisesRegex(ValueError, 'is not a subclass of'):
+            InheritanceManagerTestParent.objects.prefetch_subclass_related(
+                {TimeFrame: ['tags']})
+
+
+class InheritanceManagerSubclassFieldsTests(TestCase):
+    def setUp(self) -> None:
+        self.child1 = InheritanceManagerTestChild1.objects.create(  # type: ignore[misc]
+            normal_field='a', normal_field_2='b')
+        self.grandchild1 = InheritanceManagerTestGrandChild1.objects.create(  # type: ignore[misc]
+            normal_field='c', normal_field_2='d', text_field='e')
+        self.child2 = InheritanceManagerTestChild2.objects.create(  # type: ignore[misc]
+            normal_field='f', normal_field_2='g')
+
+    def test_fields_restrict_subclass_columns(self) -> None:
+        qs = InheritanceManagerTestParent.objects.select_subclasses(
+            InheritanceManagerTestChild1,
+            InheritanceManagerTestChild2,
+            fields={InheritanceManagerTestChild2: ['normal_field_2']},
+        ).order_by('pk')
+        sql = str(qs.query)
+        self.assertIn('"tests_inheritancemanagertestchild2"."normal_field_2"', sql)
+        self.assertNotIn(
+            '"tests_inheritancemanagertestchild2"."non_related_field_using_descriptor_2"', sql)
+        self.assertIn('"tests_inheritancemanagertestchild1"."normal_field_2"', sql)
+
+        child1, grandchild1, child2 = qs
+        self.assertIsInstance(child2, InheritanceManagerTestChild2)
+        self.assertEqual(
+            child2.get_deferred_fields(), {'non_related_field_using_descriptor_2'})
+        self.assertEqual(child2.normal_field, 'f')
+        self.assertEqual(child1.get_deferred_fields(), set())
+
+    def test_fields_of_grandchild(self) -> None:
+        qs = InheritanceManagerTestParent.objects.select_subclasses(
+            fields={InheritanceManagerTestGrandChild1: []},
+        )
+        grandchild1 = qs.get(pk=self.grandchild1.pk)
+        self.assertIsInstance(grandchild1, InheritanceManagerTestGrandChild1)
+        self.assertEqual(grandchild1.get_deferred_fields(), {'text_field'})
+        with self.assertNumQueries(1):
+            self.assertEqual(grandchild1.text_field, 'e')  # type: ignore[attr-defined]
+
+    def test_fields_require_selected_subclass(self) -> None:
+        with self.assertRaisesRegex(ValueError, 'is not among the selected subclasses'):
+            InheritanceManagerTestParent.objects.select_subclasses(
+                InheritanceManagerTestChild1,
+                fields={InheritanceManagerTestChild2: ['normal_field_2']},
+            )
+
+    def test_fields_must_exist(self) -> None:
+        with self.assertRaises(FieldDoesNotExist):
+            InheritanceManagerTestParent.objects.select_subclasses(
+                fields={InheritanceManagerTestChild2: ['title']},
+            )
+
+
+class InheritanceManagerBulkCreateSubclassTests(TestCase):
+    def test_bulk_create_grandchildren(self) -> None:
+        objs = [
+            InheritanceManagerTestGrandChild1(
+                normal_field=f'p{i}', normal_field_2=f'c{i}', text_field=f'g{i}')
+            for i in range(5)
+        ]
+        # three batches for each of the three tables
+        with self.assertNumQueries(9):
+            created = InheritanceManagerTestParent.objects.bulk_create_subclass(
+                objs, batch_size=2)
+
+        self.assertEqual(created, objs)
+        self.assertEqual(len({obj.pk for obj in objs}), 5)
+        for i, obj in enumerate(objs):
+            self.assertFalse(obj._state.adding)
+            self.assertEqual(obj.pk, obj.inheritancemanagertestparent_ptr_id)
+            self.assertEqual(obj.pk, obj.inheritancemanagertestchild1_ptr_id)
+            fetched = InheritanceManagerTestParent.objects.get_subclass(pk=obj.pk)
+            self.assertIsInstance(fetched, InheritanceManagerTestGrandChild1)
+            self.assertEqual(fetched.normal_field, f'p{i}')
+            self.assertEqual(fetched.normal_field_2, f'c{i}')  # type: ignore[attr-defined]
+            self.assertEqual(fetched.text_field, f'g{i}')  # type: ignore[attr-defined]
+
+    def test_bulk_create_custom_parent_link_column(self) -> None:
+        objs = [InheritanceManagerTestChild3_1() for _ in range(3)]
+        InheritanceManagerTestParent.objects.bulk_create_subclass(objs)
+        self.assertEqual(
+            set(InheritanceManagerTestChild3_1.objects.values_list('pk', flat=True)),
+            {obj.pk for obj in objs},
+        )
+
+    def test_bulk_create_preassigned_pks(self) -> None:
+        objs = [
+            InheritanceManagerTestChild1(pk=pk, normal_field_2='c')
+            for pk in (101, 102)
+        ]
+        InheritanceManagerTestParent.objects.bulk_create_subclass(objs)
+        self.assertEqual(
+            list(InheritanceManagerTestParent.objects.select_subclasses()
+                 .order_by('pk')),
+            objs,
+        )
+        self.assertEqual(objs[0].inheritancemanagertestparent_ptr_id, 101)
+
+    def test_bulk_create_without_returning_rows(self) -> None:
+        objs = [InheritanceManagerTestChild1() for _ in range(3)]
+        with mock.patch.object(
+            type(connection.features), 'can_return_rows_from_bulk_insert', False
+        ):
+            # parent rows are inserted one by one, child rows in one batch
+            with self.assertNumQueries(4):
+                InheritanceManagerTestParent.objects.bulk_create_subclass(objs)
+        self.assertEqual(
+            set(InheritanceManagerTestChild1.objects.values_list('pk', flat=True)),
+            {obj.pk for obj in objs},
+        )
+
+    def test_bulk_create_mixed_models(self) -> None:
+        with self.assertRaisesRegex(ValueError, 'same model'):
+            InheritanceManagerTestParent.objects.bulk_create_subclass([
+                InheritanceManagerTestChild1(),
+                InheritanceManagerTestChild2(),
+            ])
+
+    def test_bulk_create_unrelated_model(self) -> None:
+        with self.assertRaisesRegex(ValueError, 'is not a subclass of'):
+            InheritanceManagerTestChild1.objects.bulk_create_subclass(
+                [InheritanceManagerTestChild2()]
+            )
+
+
+class InheritanceIdentityMapTests(TestCase):
+    def setUp(self) -> None:
+        self.child1 = InheritanceManagerTestChild1.objects.create()
+        self.child2 = InheritanceManagerTestChild2.objects.create()
+        self.grandchild1 = InheritanceManagerTestGrandChild1.objects.create()
+
+    def test_get_subclass_is_cached(self) -> None:
+        with InheritanceIdentityMap():
+            with self.assertNumQueries(1):
+                first = InheritanceManagerTestParent.objects.get_subclass(pk=self.grandchild1.pk)
+                second = InheritanceManagerTestParent.objects.get_subclass(
+                    pk=str(self.grandchild1.pk))
+        self.assertIs(first, second)
+        self.assertIsInstance(first, InheritanceManagerTestGrandChild1)
+
+    def test_not_cached_outside_context(self) -> None:
+        with InheritanceIdentityMap():
+            InheritanceManagerTestParent.objects.get_subclass(pk=self.child1.pk)
+        with self.assertNumQueries(2):
+            InheritanceManagerTestParent.objects.get_subclass(pk=self.child1.pk)
+            InheritanceManagerTestParent.objects.get_subclass(pk=self.child1.pk)
+
+    def test_decorator(self) -> None:
+        @InheritanceIdentityMap()
+        def lookup() -> list[InheritanceManagerTestParent]:
+            return [
+                InheritanceManagerTestParent.objects.get_subclass(pk=self.child2.pk)
+                for _ in range(3)
+            ]
+
+        with self.assertNumQueries(1):
+            lookup()
+        with self.assertNumQueries(1):
+            lookup()
+
+    def test_filter_pk_in(self) -> None:
+        pks = [self.grandchild1.pk, self.child1.pk, self.child2.pk]
+        with InheritanceIdentityMap():
+            InheritanceManagerTestParent.objects.get_subclass(pk=self.child1.pk)
+            with self.assertNumQueries(1):
+                objs = list(
+                    InheritanceManagerTestParent.objects.select_subclasses().filter(pk__in=pks))
+            self.assertEqual([obj.pk for obj in objs], pks)
+            self.assertEqual(
+                [type(obj) for obj in objs],
+                [
+                    InheritanceManagerTestGrandChild1,
+                    InheritanceManagerTestChild1,
+                    InheritanceManagerTestChild2,
+                ],
+            )
+            with self.assertNumQueries(0):
+                again = list(
+                    InheritanceManagerTestParent.objects.select_subclasses().filter(pk__in=pks))
+                InheritanceManagerTestParent.objects.get_subclass(pk=self.grandchild1.pk)
+        self.assertEqual(objs, again)
+        self.assertIs(objs[0], again[0])
+
+    def test_restricted_querysets_are_not_cached(self) -> None:
+        with InheritanceIdentityMap():
+            InheritanceManagerTestParent.objects.get_subclass(pk=self.child1.pk)
+            with self.assertNumQueries(3):
+                InheritanceManagerTestParent.objects.filter(
+                    normal_field='').get_subclass(pk=self.child1.pk)
+                list(InheritanceManagerTestParent.objects.select_subclasses(
+                    InheritanceManagerTestChild2).filter(pk__in=[self.child1.pk]))
+                list(InheritanceManagerTestParent.objects.select_subclasses()
+                     .filter(pk__in=[self.child1.pk]).order_by('-pk'))
+
+    def test_save_evicts(self) -> None:
+        with InheritanceIdentityMap():
+            child1 = InheritanceManagerTestParent.objects.get_subclass(pk=self.child1.pk)
+            self.child1.normal_field = 'changed'
+            self.child1.save()
+            with self.assertNumQueries(1):
+                reloaded = InheritanceManagerTestParent.objects.get_subclass(pk=self.child1.pk)
+        self.assertIsNot(reloaded, child1)
+        self.assertEqual(reloaded.normal_field, 'changed')
+
+    def test_delete_evicts(self) -> None:
+        with InheritanceIdentityMap():
+            InheritanceManagerTestParent.objects.get_subclass(pk=self.grandchild1.pk)
+            InheritanceManagerTestGrandChild1.objects.filter(pk=self.grandchild1.pk).delete()
+            with self.assertRaises(InheritanceManagerTestParent.DoesNotExist):
+                InheritanceManagerTestParent.objects.get_subclass(pk=self.grandchild1.pk)
+            self.assertEqual(
+                list(InheritanceManagerTestParent.objects.select_subclasses()
+                     .filter(pk__in=[self.grandchild1.pk])),
+                [],
+            )
+
+    def test_signal_receivers_disconnected_on_exit(self) -> None:
+        with InheritanceIdentityMap():
+            self.assertTrue(models.signals.post_delete.has_listeners(InheritanceManagerTestTag))
+        self.assertFalse(models.signals.post_delete.has_listeners(InheritanceManagerTestTag))
+
+    def test_decorator_shared_by_threads(self) -> None:
+        entered = [threading.Event(), threading.Event()]
+        released = [threading.Event(), threading.Event()]
+
+        @InheritanceIdentityMap()
+        def run(n: int) -> None:
+            entered[n].set()
+            released[n].wait(5)
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            first = executor.submit(run, 0)
+            entered[0].wait(5)
+            second = executor.submit(run, 1)
+            entered[1].wait(5)
+            # the thread that entered first exits first
+            released[0].set()
+            first.result(5)
+            released[1].set()
+            second.result(5)
+        self.assertEqual(InheritanceIdentityMap._active_count, 0)
+        self.assertFalse(models.signals.post_delete.has_listeners(InheritanceManagerTestTag))
+
+
+class InheritanceManagerSubclassCacheTests(TestCase):
+    def setUp(self) -> None:
+        inheritance_subclass_cache.clear()
+        self.addCleanup(inheritance_subclass_cache.clear)
+        self.child1 = InheritanceManagerTestChild1.objects.create()
+        self.child2 = InheritanceManagerTestChild2.objects.create()
+        self.grandchild1 = InheritanceManagerTestGrandChild1.objects.create()
+
+    def cached_label(self, obj: models.Model) -> str | None:
+        return inheritance_subclass_cache.get(
+            f'model_utils:subclass:default:tests.inheritancemanagertestparent:{obj.pk}')
+
+    def test_iteration_populates_cache(self) -> None:
+        list(InheritanceManagerTestParent.cached_objects.select_subclasses())
+        self.assertEqual(self.cached_label(self.child1), 'tests.InheritanceManagerTestChild1')
+        self.assertEqual(self.cached_label(self.child2), 'tests.InheritanceManagerTestChild2')
+        self.assertEqual(
+            self.cached_label(self.grandchild1), 'tests.InheritanceManagerTestGrandChild1')
+
+    def test_partial_selection_only_caches_definitive_subclasses(self) -> None:
+        list(InheritanceManagerTestParent.cached_objects.select_subclasses(
+            InheritanceManagerTestChild1, InheritanceManagerTestChild2))
+        # child1 objects may still be instances of an unselected grandchild
+        self.assertIsNone(self.cached_label(self.child1))
+        self.assertIsNone(self.cached_label(self.grandchild1))
+        self.assertEqual(self.cached_label(self.child2), 'tests.InheritanceManagerTestChild2')
+
+    def test_get_subclass_joins_only_cached_subclass(self) -> None:
+        manager = InheritanceManagerTestParent.cached_objects
+        self.assertIsInstance(manager.get_subclass(pk=self.child2.pk), InheritanceManagerTestChild2)
+        with CaptureQueriesContext(connection) as queries:
+            child2 = manager.get_subclass(pk=self.child2.pk)
+        self.assertIsInstance(child2, InheritanceManagerTestChild2)
+        self.assertEqual(len(queries), 1)
+        sql = queries[0]['sql']
+        self.assertIn(InheritanceManagerTestChild2._meta.db_table, sql)
+        self.assertNotIn(InheritanceManagerTestChild1._meta.db_table, sql)
+
+    def test_get_subclass_cached_subclass_with_subclasses(self) -> None:
+        manager = InheritanceManagerTestParent.cached_objects
+        manager.get_subclass(pk=self.grandchild1.pk)
+        with CaptureQueriesContext(connection) as queries:
+            grandchild1 = manager.get_subclass(pk=self.grandchild1.pk)
+        self.assertIsInstance(grandchild1, InheritanceManagerTestGrandChild1)
+        self.assertNotIn(InheritanceManagerTestChild2._meta.db_table, queries[0]['sql'])
+
+    def test_stale_entry(self) -> None:
+        manager = InheritanceManagerTestParent.cached_objects
+        manager.get_subclass(pk=self.child1.pk)
+        InheritanceManagerTestGrandChild1.objects.create(  # type: ignore[misc]
+            inheritancemanagertestchild1_ptr=self.child1, text_field='t')
+        # the cached subclass's own subclasses are still checked
+        self.assertIsInstance(
+            manager.get_subclass(pk=self.child1.pk), InheritanceManagerTestGrandChild1)
+
+        inheritance_subclass_cache.set_many({
+            'model_utils:subclass:default:tests.inheritancemanagertestparent:'
+            f'{self.child2.pk}': 'tests.InheritanceManagerTestChild1',
+        })
+        with self.assertNumQueries(2):
+            child2 = manager.get_subclass(pk=self.child2.pk)
+        self.assertIsInstance(child2, InheritanceManagerTestChild2)
+        self.assertEqual(self.cached_label(self.child2), 'tests.InheritanceManagerTestChild2')
+
+    def test_delete_evicts(self) -> None:
+        manager = InheritanceManagerTestParent.cached_objects
+        manager.get_subclass(pk=self.grandchild1.pk)
+        pk = self.grandchild1.pk
+        self.grandchild1.delete()
+        self.grandchild1.pk = pk
+        self.assertIsNone(self.cached_label(self.grandchild1))
+
+    def test_without_cache(self) -> None:
+        list(InheritanceManagerTestParent.objects.select_subclasses())
+        self.assertEqual(len(inheritance_subclass_cache), 0)
+
+
+@override_settings(DATABASE_ROUTERS=['tests.routers.ReadWriteSplitRouter'])
+class InheritanceManagerSubclassCacheRouterTests(TransactionTestCase):
+    databases = {'default', 'replica'}
+
+    def setUp(self) -> None:
+        inheritance_subclass_cache.clear()
+        self.addCleanup(inheritance_subclass_cache.clear)
+
+    def test_delete_evicts_entry_read_from_replica(self) -> None:
+        grandchild1 = InheritanceManagerTestGrandChild1.objects.create()
+        pk = grandchild1.pk
+        manager = InheritanceManagerTestParent.cached_objects
+        self.assertEqual(manager.get_subclass(pk=pk)._state.db, 'replica')
+        key = f'model_utils:subclass:default:tests.inheritancemanagertestparent:{pk}'
+        self.assertEqual(
+            inheritance_subclass_cache.get(key), 'tests.InheritanceManagerTestGrandChild1')
+        grandchild1.delete()
+        self.assertIsNone(inheritance_subclass_cache.get(key))
+
+
+class InheritanceManagerAsyncTests(TestCase):
+    def setUp(self) -> None:
+        self.child1 = InheritanceManagerTestChild1.objects.create()
+        self.child2 = InheritanceManagerTestChild2.objects.create()
+        self.grandchild1 = InheritanceManagerTestGrandChild1.objects.create()
+
+    async def test_async_for(self) -> None:
+        qs = InheritanceManagerTestParent.objects.select_subclasses().order_by('pk')
+        objs = [obj async for obj in qs]
+        self.assertEqual(
+            [type(obj) for obj in objs],
+            [
+                InheritanceManagerTestChild1,
+                InheritanceManagerTestChild2,
+                InheritanceManagerTestGrandChild1,
+            ],
+        )
+        # the result cache is filled
+        self.assertEqual(qs._result_cache, objs)
+
+    async def test_subclasses_resolved_in_event_loop(self) -> None:
+        loops: list[asyncio.AbstractEventLoop | None] = []
+        orig = InheritanceQuerySet._get_sub_obj_recurse
+
+        def get_sub_obj_recurse(*args: object) -> object:
+            try:
+                loops.append(asyncio.get_running_loop())
+            except RuntimeError:
+                loops.append(None)
+            return orig(*args)  # type: ignore[arg-type]
+
+        with mock.patch.object(
+            InheritanceQuerySet, '_get_sub_obj_recurse', autospec=True,
+            side_effect=get_sub_obj_recurse,
+        ):
+            objs = [obj async for obj in InheritanceManagerTestParent.objects.select_subclasses()]
+        self.assertEqual(len(objs), 3)
+        self.assertTrue(loops)
+        self.assertTrue(all(loop is asyncio.get_running_loop() for loop in loops))
+
+    async def test_aiterator(self) -> None:
+        qs = InheritanceManagerTestParent.objects.select_subclasses().order_by('pk')
+        objs = [obj async for obj in qs.aiterator(chunk_size=2)]
+        self.assertIsInstance(objs[2], InheritanceManagerTestGrandChild1)
+        self.assertIsNone(qs._result_cache)
+
+    async def test_async_for_with_subclass_prefetch(self) -> None:
+        tag = await InheritanceManagerTestTag.objects.acreate(name='tag')
+        await self.child1.tags.aadd(tag)  # type: ignore[attr-defined]
+        qs = InheritanceManagerTestParent.objects.select_subclasses().prefetch_subclass_related(
+            {InheritanceManagerTestChild1: ['tags']}).order_by('pk')
+        objs = [obj async for obj in qs]
+        self.assertEqual(
+            list(objs[0]._prefetched_objects_cache['tags']), [tag])  # type: ignore[attr-defined]
+
+    async def test_aget_subclass(self) -> None:
+        obj = await InheritanceManagerTestParent.objects.aget_subclass(pk=self.grandchild1.pk)
+        self.assertIsInstance(obj, InheritanceManagerTestGrandChild1)
+
+    async def test_ainstance_of(self) -> None:
+        objs = [
+            obj async for obj in
+            InheritanceManagerTestParent.objects.ainstance_of(InheritanceManagerTestChild2)
+        ]
+        self.assertEqual(objs, [self.child2])
+        self.assertIsInstance(objs[0], InheritanceManagerTestChild2)
+
+
+class InheritanceManagerUnionStrategyTests(TestCase):
+    def setUp(self) -> None:
+        self.child1 = InheritanceManagerTestChild1.objects.create(  # type: ignore[misc]
+            normal_field='a', normal_field_2='b')
+        self.child2 = InheritanceManagerTestChild2.objects.create(  # type: ignore[misc]
+            normal_field='c', normal_field_2='d')
+        self.grandchild1 = InheritanceManagerTestGrandChild1.objects.create(  # type: ignore[misc]
+            normal_field='e', normal_field_2='f', text_field='g')
+        self.parent = InheritanceManagerTestParent.objects.create(normal_field='h')
+
+    def assertSameResults(
+        self,
+        union: InheritanceQuerySet[InheritanceManagerTestParent],
+        join: InheritanceQuerySet[InheritanceManagerTestParent],
+    ) -> None:
+        union_objs = list(union)
+        join_objs = list(join)
+        self.assertEqual(union_objs, join_objs)
+        self.assertEqual(
+            [(type(obj), vars(obj).keys() - {'_state'}) for obj in union_objs],
+            [(type(obj), vars(obj).keys() - {'_state'}) for obj in join_objs],
+        )
+        for union_obj, join_obj in zip(union_objs, join_objs):
+            for field in type(join_obj)._meta.fields:
+                self.assertEqual(
+                    getattr(union_obj, field.attname), getattr(join_obj, field.attname))
+
+    def test_matches_join_strategy(self) -> None:
+        manager = InheritanceManagerTestParent.objects
+        self.assertSameResults(
+            manager.select_subclasses(strategy='union').order_by('-pk'),
+            manager.select_subclasses().order_by('-pk'),
+        )
+
+    def test_selected_subclasses(self) -> None:
+        manager = InheritanceManagerTestParent.objects
+        self.assertSameResults(
+            manager.select_subclasses(
+                InheritanceManagerTestGrandChild1, InheritanceManagerTestChild2,
+                strategy='union',
+            ).order_by('pk'),
+            manager.select_subclasses(
+                InheritanceManagerTestGrandChild1, InheritanceManagerTestChild2,
+            ).order_by('pk'),
+        )
+
+    def test_filter_and_slice(self) -> None:
+        qs = InheritanceManagerTestParent.objects.select_subclasses(
+            strategy='union').exclude(normal_field='a').order_by('normal_field')
+        self.assertEqual(list(qs[1:3]), [self.grandchild1, self.parent])
+        self.assertEqual(qs.count(), 3)
+
+    def test_order_by_subclass_field(self) -> None:
+        manager = InheritanceManagerTestParent.objects
+        ordering = ('-inheritancemanagertestchild1__normal_field_2', 'normal_field')
+        self.assertSameResults(
+            manager.select_subclasses(strategy='union').order_by(*ordering),
+            manager.select_subclasses().order_by(*ordering),
+        )
+
+    def test_order_by_related_field_not_supported(self) -> None:
+        qs = InheritanceManagerTestParent.objects.select_subclasses(
+            strategy='union').order_by('related__pk')
+        with self.assertRaisesRegex(NotSupportedError, "'related__pk'"):
+            list(qs)
+
+    def test_select_related_not_supported(self) -> None:
+        qs = InheritanceManagerTestParent.objects.select_subclasses(
+            strategy='union').select_related('related')
+        with self.assertRaises(NotSupportedError):
+            list(qs)
+
+    def test_single_union_query(self) -> None:
+        with CaptureQueriesContext(connection) as queries:
+            objs = list(
+                InheritanceManagerTestParent.objects.select_subclasses(strategy='union'))
+        self.assertEqual(len(objs), 4)
+        self.assertEqual(len(queries), 1)
+        self.assertIn('UNION ALL', queries[0]['sql'])
+
+    def test_iterator(self) -> None:
+        qs = InheritanceManagerTestParent.objects.select_subclasses(
+            strategy='union').order_by('pk')
+        self.assertEqual(
+            [type(obj) for obj in qs.iterator(chunk_size=2)],
+            [
+                InheritanceManagerTestChild1,
+                InheritanceManagerTestChild2,
+                InheritanceManagerTestGrandChild1,
+                InheritanceManagerTestParent,
+            ],
+        )
+
+    def test_prefetch_subclass_related(self) -> None:
+        tag = InheritanceManagerTestTag.objects.create(name='tag')
+        self.child1.tags.add(tag)  # type: ignore[attr-defined]
+        qs = InheritanceManagerTestParent.objects.select_subclasses(
+            strategy='union',
+        ).prefetch_subclass_related({InheritanceManagerTestChild1: ['tags']}).order_by('pk')
+        with self.assertNumQueries(2):
+            objs = list(qs)
+            self.assertEqual(list(objs[0].tags.all()), [tag])  # type: ignore[attr-defined]
+
+    def test_switch_back_to_join(self) -> None:
+        qs = InheritanceManagerTestParent.objects.select_subclasses(
+            strategy='union').select_subclasses()
+        with CaptureQueriesContext(connection) as queries:
+            list(qs)
+        self.assertNotIn('UNION', queries[0]['sql'])
+
+    def test_unknown_strategy(self) -> None:
+        with self.assertRaisesRegex(ValueError, 'Unknown strategy'):
+            InheritanceManagerTestParent.objects.select_subclasses(strategy='split')
+
+    def test_fields_not_supported(self) -> None:
+        with self.assertRaisesRegex(ValueError, 'fields'):
+            InheritanceManagerTestParent.objects.select_subclasses(
+                fields={InheritanceManagerTestChild2: []}, strategy='union')
+
+    def test_annotations_not_supported(self) -> None:
+        qs = InheritanceManagerTestParent.objects.select_subclasses(
+            strategy='union').annotate(models.Count('related'))
+        with self.assertRaises(NotSupportedError):
+            list(qs)
+
+
+class InheritanceManagerSubclassDepthTests(TestCase):
+    def setUp(self) -> None:
+        self.child1 = InheritanceManagerTestChild1.objects.create()
+        self.child2 = InheritanceManagerTestChild2.objects.create()
+        self.grandchild1 = InheritanceManagerTestGrandChild1.objects.create()
+
+    def test_max_depth(self) -> None:
+        qs = InheritanceManagerTestParent.objects.select_subclasses(max_depth=1)
+        self.assertEqual(
+            set(qs.subclasses),
+            {path for path in qs._get_subclasses_recurse(InheritanceManagerTestParent)
+             if LOOKUP_SEP not in path},
+        )
+        with CaptureQueriesContext(connection) as queries:
+            objs = list(qs.order_by('pk'))
+        self.assertNotIn(InheritanceManagerTestGrandChild1._meta.db_table, queries[0]['sql'])
+        self.assertEqual(
+            [type(obj) for obj in objs],
+            [
+                InheritanceManagerTestChild1,
+                InheritanceManagerTestChild2,
+                InheritanceManagerTestChild1,
+            ],
+        )
+
+    def test_leaves_only(self) -> None:
+        qs = InheritanceManagerTestParent.objects.select_subclasses(leaves_only=True)
+        self.assertNotIn('inheritancemanagertestchild1', qs.subclasses)
+        self.assertIn(
+            'inheritancemanagertestchild1__inheritancemanagertestgrandchild1', qs.subclasses)
+        self.assertEqual(
+            [type(obj) for obj in qs.order_by('pk')],
+            [
+                InheritanceManagerTestParent,
+                InheritanceManagerTestChild2,
+                InheritanceManagerTestGrandChild1,
+            ],
+        )
+
+    def test_leaves_only_with_max_depth(self) -> None:
+        qs = InheritanceManagerTestParent.objects.select_subclasses(
+            max_depth=1, leaves_only=True)
+        self.assertNotIn('inheritancemanagertestchild1', qs.subclasses)
+        self.assertIn('inheritancemanagertestchild2', qs.subclasses)
+        self.assertTrue(all(LOOKUP_SEP not in path for path in qs.subclasses))
+
+    def test_explicit_subclasses(self) -> None:
+        qs = InheritanceManagerTestParent.objects.select_subclasses(
+            InheritanceManagerTestChild1, InheritanceManagerTestGrandChild1, max_depth=1)
+        self.assertEqual(qs.subclasses, ['inheritancemanagertestchild1'])
+
+    def test_subclasses_sorted_deepest_first(self) -> None:
+        qs = InheritanceManagerTestParent.objects.select_subclasses(
+            InheritanceManagerTestChild1, InheritanceManagerTestGrandChild1)
+        self.assertEqual(qs.subclasses, [
+            'inheritancemanagertestchild1__inheritancemanagertestgrandchild1',
+            'inheritancemanagertestchild1',
+        ])
+
+    def test_invalid_max_depth(self) -> None:
+        with self.assertRaises(ValueError):
+            InheritanceManagerTestParent.objects.select_subclasses(max_depth=0)
+
+
+class InheritanceManagerSubclassLabelTests(TestCase):
+    def setUp(self) -> None:
+        self.parent = InheritanceManagerTestParent.objects.create()
+        self.child1 = InheritanceManagerTestChild1.objects.create()
+        self.child2 = InheritanceManagerTestChild2.objects.create()
+        self.grandchild1 = InheritanceManagerTestGrandChild1.objects.create()
+
+    def test_values(self) -> None:
+        with self.assertNumQueries(1):
+            rows = list(
+                InheritanceManagerTestParent.objects.with_subclass_label('kind')  # type: ignore[misc]
+                .order_by('pk').values('pk', 'kind')
+            )
+        self.assertEqual(rows, [
+            {'pk': self.parent.pk, 'kind': 'tests.InheritanceManagerTestParent'},
+            {'pk': self.child1.pk, 'kind': 'tests.InheritanceManagerTestChild1'},
+            {'pk': self.child2.pk, 'kind': 'tests.InheritanceManagerTestChild2'},
+            {'pk': self.grandchild1.pk, 'kind': 'tests.InheritanceManagerTestGrandChild1'},
+        ])
+
+    def test_values_list_of_selected_subclasses(self) -> None:
+        rows = (
+            InheritanceManagerTestParent.objects  # type: ignore[misc]
+            .select_subclasses(InheritanceManagerTestChild1)
+            .with_subclass_label('kind')
+            .order_by('pk')
+            .values_list('kind', flat=True)
+        )
+        self.assertEqual(list(rows), [
+            'tests.InheritanceManagerTestParent',
+            'tests.InheritanceManagerTestChild1',
+            'tests.InheritanceManagerTestParent',
+            'tests.InheritanceManagerTestChild1',
+        ])
+
+    def test_filter_on_label(self) -> None:
+        qs = InheritanceManagerTestParent.objects.with_subclass_label('kind').filter(  # type: ignore[misc]
+            kind='tests.InheritanceManagerTestChild2')
+        self.assertEqual(list(qs.values_list('pk', flat=True)), [self.child2.pk])
+
+    def test_label_copied_onto_subclass_instances(self) -> None:
+        grandchild1 = InheritanceManagerTestParent.objects.select_subclasses().with_subclass_label(
+            'kind').get(pk=self.grandchild1.pk)
+        self.assertIsInstance(grandchild1, InheritanceManagerTestGrandChild1)
+        self.assertEqual(
+            grandchild1.kind,  # type: ignore[attr-defined]
+            'tests.InheritanceManagerTestGrandChild1',
+        )
+
+
+class InheritanceManagerInstanceOfWriteTests(TestCase):
+    def setUp(self) -> None:
+        self.place = InheritanceManagerTestPlace.objects.create(name='park')
+        self.restaurant = InheritanceManagerTestRestaurant.objects.create(name='diner')
+        self.pizzeria = InheritanceManagerTestPizzeria.objects.create(name='napoli')
+        self.bar = InheritanceManagerTestBar.objects.create(name='pub')
+        InheritanceManagerTestMenuItem.objects.create(restaurant_id=self.restaurant.pk)
+        InheritanceManagerTestMenuItem.objects.create(restaurant_id=self.pizzeria.pk)
+
+    def test_count(self) -> None:
+        qs = InheritanceManagerTestPlace.objects.instance_of(InheritanceManagerTestRestaurant)
+        self.assertEqual(qs.count(), 2)
+
+    def test_update_parent_field(self) -> None:
+        with self.assertNumQueries(1):
+            updated = InheritanceManagerTestPlace.objects.instance_of(
+                InheritanceManagerTestRestaurant).update(name='closed')
+        self.assertEqual(updated, 2)
+        self.assertEqual(
+            set(InheritanceManagerTestPlace.objects.values_list('name', flat=True)),
+            {'park', 'closed', 'pub'},
+        )
+
+    def test_update_subclass_field(self) -> None:
+        updated = InheritanceManagerTestPlace.objects.instance_of(
+            InheritanceManagerTestRestaurant).filter(name='napoli').update(serves_pizza=True)
+        self.assertEqual(updated, 1)
+        self.assertEqual(
+            list(InheritanceManagerTestRestaurant.objects.filter(  # type: ignore[misc]
+                serves_pizza=True).values_list('pk', flat=True)),
+            [self.pizzeria.pk],
+        )
+
+    def test_update_unknown_field(self) -> None:
+        with self.assertRaises(FieldDoesNotExist):
+            InheritanceManagerTestPlace.objects.instance_of(
+                InheritanceManagerTestBar).update(serves_pizza=True)
+
+    def test_delete(self) -> None:
+        with self.assertNumQueries(5):
+            deleted = InheritanceManagerTestPlace.objects.instance_of(
+                InheritanceManagerTestRestaurant).delete()
+        self.assertEqual(deleted, (7, {
+            'tests.InheritanceManagerTestMenuItem': 2,
+            'tests.InheritanceManagerTestPizzeria': 1,
+            'tests.InheritanceManagerTestRestaurant': 2,
+            'tests.InheritanceManagerTestPlace': 2,
+        }))
+        self.assertEqual(
+            list(InheritanceManagerTestPlace.objects.select_subclasses().order_by('pk')),
+            [self.place, self.bar],
+        )
+        self.assertFalse(InheritanceManagerTestMenuItem.objects.exists())
+
+    def test_delete_filtered(self) -> None:
+        deleted = InheritanceManagerTestPlace.objects.instance_of(
+            InheritanceManagerTestPizzeria).filter(name='napoli').delete()
+        self.assertEqual(deleted[0], 4)
+        self.assertEqual(InheritanceManagerTestRestaurant.objects.get(), self.restaurant)
+
+    def test_delete_with_receiver_uses_collector(self) -> None:
+        deleted_pks = []
+
+        def receiver(instance: InheritanceManagerTestPizzeria, **kwargs: object) -> None:
+            deleted_pks.append(instance.pk)
+
+        pre_delete.connect(receiver, sender=InheritanceManagerTestPizzeria)
+        self.addCleanup(pre_delete.disconnect, receiver, sender=InheritanceManagerTestPizzeria)
+        deleted = InheritanceManagerTestPlace.objects.instance_of(
+            InheritanceManagerTestRestaurant).delete()
+        self.assertEqual(deleted[0], 7)
+        self.assertEqual(deleted_pks, [self.pizzeria.pk])
+
+    def test_delete_with_cascades_uses_collector(self) -> None:
+        InheritanceManagerTestChild1.objects.create()
+        child2 = InheritanceManagerTestChild2.objects.create()
+        deleted = InheritanceManagerTestParent.objects.instance_of(
+            InheritanceManagerTestChild1).delete()
+        self.assertEqual(deleted[1]['tests.InheritanceManagerTestChild1'], 1)
+        self.assertEqual(InheritanceManagerTestParent.objects.get().pk, child2.pk)
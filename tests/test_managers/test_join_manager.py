@@ -1,7 +1,13 @@
 from __future__ import annotations
 
-from django.test import TestCase
+import gc
 
+from django.apps import apps
+from django.db import DatabaseError, connection, connections, transaction
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+
+from model_utils.managers import _unused_join_tables
 from tests.models import BoxJoinModel, JoinItemForeignKey
 
 
@@ -17,8 +23,13 @@ class JoinManagerTest(TestCase):
 
     def test_self_join(self) -> None:
         a_slice = BoxJoinModel.objects.all()[0:10]
-        with self.assertNumQueries(1):
+        with CaptureQueriesContext(connection) as queries:
             result = a_slice.join()
+        # the table and its index are created, without running the query
+        self.assertEqual(
+            [query['sql'].split()[:2] for query in queries if not query['sql'].startswith('DROP')],
+            [['CREATE', 'TEMPORARY'], ['CREATE', 'INDEX']],
+        )
         self.assertEqual(result.count(), 10)
 
     def test_self_join_with_where_statement(self) -> None:
@@ -37,3 +48,37 @@ class JoinManagerTest(TestCase):
         items = JoinItemForeignKey.objects.all().join(box_qs)
         self.assertEqual(items.count(), 1)
         self.assertEqual(items[0].weight, 10)
+
+    def test_joins_use_own_tables(self) -> None:
+        first = BoxJoinModel.objects.filter(name='name_1').join()
+        second = BoxJoinModel.objects.all()[0:5].join()
+        self.assertEqual((first.count(), second.count()), (1, 5))
+
+    def test_join_model_reused(self) -> None:
+        BoxJoinModel.objects.filter(name='name_1').join()
+        JoinItemForeignKey.objects.all().join(BoxJoinModel.objects.all())
+        models = len(apps.all_models['model_utils'])
+        BoxJoinModel.objects.filter(name='name_2').join()
+        JoinItemForeignKey.objects.filter(weight=10).join(BoxJoinModel.objects.all())
+        self.assertEqual(len(apps.all_models['model_utils']), models)
+
+    def test_unused_table_dropped(self) -> None:
+        result = BoxJoinModel.objects.filter(name='name_1').join()
+        table = result.query.alias_map[list(result.query.alias_map)[-1]].table_name
+        del result
+        gc.collect()
+        self.assertIn(table, _unused_join_tables[connections['default']])
+        with CaptureQueriesContext(connection) as queries:
+            BoxJoinModel.objects.filter(name='name_2').join()
+        self.assertIn(f'DROP TABLE IF EXISTS "{table}"', [query['sql'] for query in queries])
+        self.assertNotIn(table, _unused_join_tables[connections['default']])
+
+
+class JoinTransactionTest(TransactionTestCase):
+    def test_table_dropped_on_commit(self) -> None:
+        BoxJoinModel.objects.create(name='name')
+        with transaction.atomic():
+            result = BoxJoinModel.objects.all().join()
+            self.assertEqual(result.count(), 1)
+        with self.assertRaises(DatabaseError):
+            result.count()
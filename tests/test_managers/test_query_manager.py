@@ -1,8 +1,24 @@
 from __future__ import annotations
 
-from django.test import TestCase
+from unittest import mock
 
-from tests.models import Post
+from django.core.cache import caches
+from django.core.signals import request_finished
+from django.db import connection, connections, models, transaction
+from django.db.migrations.state import ModelState
+from django.test import SimpleTestCase, TestCase, TransactionTestCase
+from django.test.utils import (
+    CaptureQueriesContext,
+    isolate_apps,
+    override_settings,
+)
+
+from model_utils.managers import (
+    QueryManager,
+    paginate_by_keyset,
+    query_manager_cache,
+)
+from tests.models import CachedPost, Post, PostComment, StatusReadFromReplica
 
 
 class QueryManagerTests(TestCase):
@@ -27,3 +43,316 @@ class QueryManagerTests(TestCase):
     def test_ordering(self) -> None:
         qs = Post.public_reversed.all()
         self.assertEqual([p.order for p in qs], [5, 4, 1, 0])
+
+
+class QueryManagerKeysetPaginationTests(TestCase):
+    def setUp(self) -> None:
+        for order in (3, 1, 2, 2, 0):
+            Post.objects.create(published=True, order=order)
+        Post.objects.create(published=False, order=4)
+
+    def test_pages(self) -> None:
+        posts, cursor = Post.public_reversed.after(limit=2)
+        self.assertEqual([p.order for p in posts], [3, 2])
+        self.assertIsNotNone(cursor)
+        seen = posts
+        with self.assertNumQueries(1):
+            posts, cursor = Post.public_reversed.after(cursor, limit=2)
+        self.assertEqual([p.order for p in posts], [2, 1])
+        seen += posts
+        posts, cursor = Post.public_reversed.after(cursor, limit=2)
+        self.assertEqual([p.order for p in posts], [0])
+        self.assertIsNone(cursor)
+        seen += posts
+        self.assertEqual(seen, list(Post.public_reversed.all().order_by('-order', 'pk')))
+
+    def test_pages_in_model_ordering(self) -> None:
+        posts, cursor = Post.public.after(limit=3)
+        more, cursor = Post.public.after(cursor, limit=3)
+        self.assertIsNone(cursor)
+        self.assertEqual(posts + more, list(Post.public.all().order_by('order', 'pk')))
+
+    def test_exact_last_page(self) -> None:
+        posts, cursor = Post.public.after(limit=5)
+        self.assertEqual(len(posts), 5)
+        self.assertIsNone(cursor)
+
+    def test_invalid_cursor(self) -> None:
+        for cursor in ('not a cursor', 'WzFd', 'WyJhIiwxXQ'):
+            with self.subTest(cursor=cursor):
+                with self.assertRaises(ValueError):
+                    Post.public_reversed.after(cursor)
+
+    def test_invalid_limit(self) -> None:
+        with self.assertRaises(ValueError):
+            Post.public.after(limit=0)
+
+    def test_foreign_key_ordering(self) -> None:
+        # The related model is ordered otherwise than by primary key.
+        posts = list(Post.objects.order_by('pk'))
+        for post in (posts[4], posts[0], posts[4], posts[2], posts[0]):
+            PostComment.objects.create(post=post)
+        comments: list[PostComment] = []
+        cursor = None
+        while True:
+            page, cursor = paginate_by_keyset(
+                PostComment.objects.all(), ('post',), cursor=cursor, limit=2)
+            comments += page
+            if cursor is None:
+                break
+        self.assertEqual(comments, list(PostComment.objects.order_by('post_id', 'pk')))
+
+    def test_invalid_ordering(self) -> None:
+        for ordering in (models.F('order').desc(), '?', 'nonexistent'):
+            with self.subTest(ordering=ordering):
+                with self.assertRaises(Exception):
+                    paginate_by_keyset(Post.objects.all(), (ordering,))
+
+
+class QueryManagerIndexTests(SimpleTestCase):
+    databases = {'default'}
+
+    def test_index_on_ordering(self) -> None:
+        index = Post._meta.indexes[0]
+        self.assertEqual(index.fields, ['-order'])
+        self.assertEqual(index.condition, models.Q(published=True))
+        self.assertLessEqual(len(index.name), index.max_name_length)
+
+    def test_index_fields_and_name(self) -> None:
+        index = Post._meta.indexes[1]
+        self.assertEqual(index.name, 'post_confirmed_idx')
+        self.assertEqual(index.fields, ['published'])
+        self.assertEqual(index.condition, models.Q(confirmed=True))
+
+    def test_index_in_migration_state(self) -> None:
+        indexes = ModelState.from_model(Post).options['indexes']
+        self.assertEqual(
+            [index.name for index in indexes], [index.name for index in Post._meta.indexes])
+
+    def test_index_created(self) -> None:
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(cursor, Post._meta.db_table)
+        self.assertIn(Post._meta.indexes[0].name, constraints)
+
+    @isolate_apps('tests')
+    def test_index_defaults_to_primary_key(self) -> None:
+        class Entry(models.Model):
+            code = models.CharField(primary_key=True, max_length=10)
+            published = models.BooleanField()
+
+            public = QueryManager(published=True).indexed()
+
+        self.assertEqual(Entry._meta.indexes[0].fields, ['code'])
+
+    @isolate_apps('tests')
+    def test_no_index_on_abstract_and_proxy_models(self) -> None:
+        class Base(models.Model):
+            published = models.BooleanField()
+
+            public = QueryManager(published=True).indexed()
+
+            class Meta:
+                abstract = True
+
+        class Entry(Base):
+            pass
+
+        class ProxyEntry(Entry):
+            drafts = QueryManager(published=False).indexed()
+
+            class Meta:
+                proxy = True
+
+        class ChildEntry(Entry):
+            pass
+
+        class OtherEntry(Base):
+            public = QueryManager(published=True)
+
+        self.assertEqual(Base._meta.indexes, [])
+        self.assertEqual(len(Entry._meta.indexes), 1)
+        self.assertEqual(ProxyEntry._meta.indexes, [])
+        self.assertEqual(ChildEntry._meta.indexes, [])
+        self.assertEqual(OtherEntry._meta.indexes, [])
+
+    @isolate_apps('tests')
+    def test_ordering_by_expression_needs_fields(self) -> None:
+        with self.assertRaises(ValueError):
+            class Entry(models.Model):
+                published = models.BooleanField()
+
+                public = QueryManager(published=True).order_by(
+                    models.F('id').desc()).indexed()
+
+
+class QueryManagerCacheTests(TestCase):
+    def setUp(self) -> None:
+        query_manager_cache.clear()
+        caches['default'].clear()
+        self.first = CachedPost.objects.create(published=True, order=1)
+        self.second = CachedPost.objects.create(published=True, order=2)
+        self.draft = CachedPost.objects.create(published=False, order=3)
+
+    def test_results_cached(self) -> None:
+        with self.assertNumQueries(1):
+            self.assertEqual(list(CachedPost.public.all()), [self.first, self.second])
+        with self.assertNumQueries(0):
+            self.assertEqual(list(CachedPost.public.all()), [self.first, self.second])
+            self.assertEqual(len(CachedPost.public.all()), 2)
+
+    def test_chained_querysets_dont_fill_cache(self) -> None:
+        with self.assertNumQueries(5):
+            self.assertEqual(CachedPost.public.count(), 2)
+            self.assertTrue(CachedPost.public.exists())
+            self.assertEqual(CachedPost.public.get(order=1), self.first)
+            self.assertEqual(list(CachedPost.public.filter(order=2)), [self.second])
+            CachedPost.public.create(published=True, order=4)
+        with self.assertNumQueries(1):
+            self.assertEqual(len(CachedPost.public.all()), 3)
+
+    def test_entries_expire(self) -> None:
+        with mock.patch('model_utils.cache.time.monotonic', return_value=100.0):
+            list(CachedPost.public.all())
+        CachedPost.objects.filter(pk=self.first.pk).update(published=False)
+        with mock.patch('model_utils.cache.time.monotonic', return_value=399.0):
+            self.assertEqual(list(CachedPost.public.all()), [self.first, self.second])
+        with mock.patch('model_utils.cache.time.monotonic', return_value=400.0):
+            self.assertEqual(list(CachedPost.public.all()), [self.second])
+
+    def test_timeout_required(self) -> None:
+        with self.assertRaises(ValueError):
+            QueryManager(published=True).cached(timeout=None)  # type: ignore[arg-type]
+
+    def test_cached_instances_are_copied(self) -> None:
+        list(CachedPost.public.all())
+        post = CachedPost.public.all()[0]
+        post.title = 'changed'
+        self.assertEqual(CachedPost.public.all()[0].title, '')
+
+    def test_chained_querysets_not_cached(self) -> None:
+        list(CachedPost.public.all())
+        with self.assertNumQueries(1):
+            self.assertEqual(list(CachedPost.public.filter(order=2)), [self.second])
+
+    def test_invalidated_on_save(self) -> None:
+        list(CachedPost.public.all())
+        self.first.title = 'changed'
+        self.first.save()
+        third = CachedPost.objects.create(published=True, order=0)
+        with self.assertNumQueries(1):
+            posts = list(CachedPost.public.all())
+        self.assertEqual(posts, [third, self.first, self.second])
+        self.assertEqual(posts[1].title, 'changed')
+
+    def test_invalidated_on_delete(self) -> None:
+        list(CachedPost.public.all())
+        self.first.delete()
+        self.assertEqual(list(CachedPost.public.all()), [self.second])
+
+    def test_pks_cached(self) -> None:
+        with self.assertNumQueries(1):
+            self.assertEqual(list(CachedPost.public_pks.all()), [self.first, self.second])
+        with self.assertNumQueries(1):
+            self.assertEqual(list(CachedPost.public_pks.all()), [self.first, self.second])
+
+    def test_pks_kept_when_tracked_fields_unchanged(self) -> None:
+        list(CachedPost.public_pks.all())
+        self.second.title = 'changed'
+        self.second.order = 0
+        self.second.save()
+        with self.assertNumQueries(1):
+            posts = list(CachedPost.public_pks.all())
+        self.assertEqual(posts, [self.second, self.first])
+        self.assertEqual(posts[0].title, 'changed')
+
+    def test_pks_invalidated_when_tracked_fields_change(self) -> None:
+        list(CachedPost.public_pks.all())
+        self.draft.published = True
+        self.draft.save()
+        with self.assertNumQueries(1):
+            self.assertEqual(
+                list(CachedPost.public_pks.all()), [self.first, self.second, self.draft])
+
+    def test_pks_invalidated_when_untracked_fields_change(self) -> None:
+        self.assertEqual(len(CachedPost.positive_pks.all()), 3)
+        self.first.order = 0
+        self.first.save()
+        self.assertEqual(len(CachedPost.positive_pks.all()), 2)
+
+    def test_django_cache_backend(self) -> None:
+        with self.assertNumQueries(1):
+            self.assertEqual(len(CachedPost.public_shared.all()), 2)
+        with self.assertNumQueries(0):
+            self.assertEqual(len(CachedPost.public_shared.all()), 2)
+        self.draft.published = True
+        self.draft.save()
+        self.assertEqual(len(CachedPost.public_shared.all()), 3)
+
+
+@override_settings(DATABASE_ROUTERS=['tests.routers.ReadWriteSplitRouter'])
+class QueryManagerCacheRouterTests(TransactionTestCase):
+    databases = {'default', 'replica'}
+
+    def setUp(self) -> None:
+        query_manager_cache.clear()
+
+    def test_write_clears_cache_read_from_replica(self) -> None:
+        self.assertEqual(list(CachedPost.public.all()), [])
+        post = CachedPost.objects.create(published=True)
+        self.assertEqual(list(CachedPost.public.all()), [post])
+        post.delete()
+        self.assertEqual(list(CachedPost.public.all()), [])
+
+
+class QueryManagerReadFromTests(TransactionTestCase):
+    databases = {'default', 'replica'}
+
+    def setUp(self) -> None:
+        Post.objects.create(published=True, order=1)
+        # writes pin reads until the end of the request
+        request_finished.send(sender=self.__class__)
+
+    def test_reads_from_replica(self) -> None:
+        qs = Post.public_replica.all()
+        self.assertEqual(qs.db, 'replica')
+        self.assertEqual([post.order for post in qs], [1])
+
+    def test_writes_to_primary(self) -> None:
+        post = Post.public_replica.get()
+        self.assertEqual(post._state.db, 'replica')
+        with CaptureQueriesContext(connections['default']) as queries:
+            post.save()
+            Post.public_replica.create(published=True, order=2)
+            Post.public_replica.update(order=3)
+        self.assertEqual(len(queries), 3)
+        self.assertEqual(post._state.db, 'default')
+
+    def test_transaction_reads_from_primary(self) -> None:
+        with transaction.atomic():
+            self.assertEqual(Post.public_replica.all().db, 'default')
+        self.assertEqual(Post.public_replica.all().db, 'replica')
+
+    def test_pinned_after_write(self) -> None:
+        with mock.patch('model_utils.managers.time.monotonic', return_value=100.0):
+            Post.objects.create(published=True, order=2)
+            self.assertEqual(Post.public_pinned.all().db, 'default')
+            self.assertEqual(Post.public_replica.all().db, 'replica')
+        with mock.patch('model_utils.managers.time.monotonic', return_value=104.0):
+            self.assertEqual(Post.public_pinned.all().db, 'default')
+        with mock.patch('model_utils.managers.time.monotonic', return_value=105.0):
+            self.assertEqual(Post.public_pinned.all().db, 'replica')
+
+    def test_pin_ends_with_request(self) -> None:
+        Post.objects.create(published=True, order=2)
+        self.assertEqual(Post.public_pinned.all().db, 'default')
+        request_finished.send(sender=self.__class__)
+        self.assertEqual(Post.public_pinned.all().db, 'replica')
+
+    def test_pinned_per_model(self) -> None:
+        StatusReadFromReplica.objects.create()
+        self.assertEqual(Post.public_pinned.all().db, 'replica')
+        self.assertEqual(StatusReadFromReplica.active.all().db, 'default')
+
+    def test_explicit_database(self) -> None:
+        self.assertEqual(Post.public_replica.db_manager('default').all().db, 'default')
+        self.assertEqual(Post.public_replica.using('default').db, 'default')
@@ -1,12 +1,13 @@
 from __future__ import annotations
 
 from django.core.exceptions import ImproperlyConfigured
+from django.core.signals import request_finished
 from django.db import models
-from django.test import TestCase
+from django.test import TestCase, TransactionTestCase
 
 from model_utils.managers import QueryManager
 from model_utils.models import StatusModel
-from tests.models import StatusManagerAdded
+from tests.models import StatusManagerAdded, StatusReadFromReplica
 
 
 class StatusManagerAddedTests(TestCase):
@@ -21,3 +22,18 @@ class StatusManagerAddedTests(TestCase):
                     ('deleted', 'Is Deleted'),
                 )
                 active = models.BooleanField()
+
+
+class StatusManagerReadFromTests(TransactionTestCase):
+    databases = {'default', 'replica'}
+
+    def setUp(self) -> None:
+        request_finished.send(sender=self.__class__)
+
+    def test_reads_from_replica(self) -> None:
+        self.assertEqual(StatusReadFromReplica.active.all().db, 'replica')
+        self.assertEqual(StatusManagerAdded.active.all().db, 'default')
+
+    def test_pinned_after_write(self) -> None:
+        StatusReadFromReplica.objects.create()
+        self.assertEqual(StatusReadFromReplica.on_hold.all().db, 'default')
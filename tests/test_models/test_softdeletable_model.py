@@ -1,9 +1,26 @@
 from __future__ import annotations
 
+from datetime import datetime, timedelta, timezone
+from io import StringIO
+from typing import Any
+from unittest import mock
+
+import time_machine
+from django.core.management import CommandError, call_command
+from django.db import connection, transaction
+from django.db.models import Q
 from django.test import TestCase
 from django.utils.connection import ConnectionDoesNotExist
 
-from tests.models import SoftDeletable
+from tests.models import (
+    CustomSoftDelete,
+    SoftDeletable,
+    SoftDeletableArchive,
+    SoftDeletableChild,
+    SoftDeletableGrandchild,
+    SoftDeletableNode,
+    SoftDeletableTimeStamped,
+)
 
 
 class SoftDeletableModelTests(TestCase):
@@ -63,3 +80,245 @@ class SoftDeletableModelTests(TestCase):
         assert result == (
             1, {SoftDeletable._meta.label: 1}
         )
+
+
+class SoftDeletableCascadeTests(TestCase):
+    def setUp(self) -> None:
+        self.a = SoftDeletable.available_objects.create(name='a')  # type: ignore[misc]
+        self.b = SoftDeletable.available_objects.create(name='b')  # type: ignore[misc]
+        self.a_child = SoftDeletableChild.available_objects.create(parent=self.a, other=self.b)  # type: ignore[misc]
+        self.b_child = SoftDeletableChild.available_objects.create(parent=self.b, other=self.a)  # type: ignore[misc]
+        for child in (self.a_child, self.a_child, self.b_child):
+            SoftDeletableGrandchild.available_objects.create(parent=child)  # type: ignore[misc]
+
+    def _available(self) -> list[int]:
+        return [
+            model.available_objects.count()
+            for model in (SoftDeletable, SoftDeletableChild, SoftDeletableGrandchild)
+        ]
+
+    def test_queryset(self) -> None:
+        with self.assertNumQueries(3):
+            result = SoftDeletable.available_objects.filter(name='a').delete(cascade=True)  # type: ignore[misc, call-arg]
+        self.assertEqual(result, (4, {
+            SoftDeletable._meta.label: 1,
+            SoftDeletableChild._meta.label: 1,
+            SoftDeletableGrandchild._meta.label: 2,
+        }))
+        self.assertEqual(self._available(), [1, 1, 1])
+        self.assertEqual(SoftDeletableChild.all_objects.get(pk=self.b_child.pk).other_id, self.a.pk)
+
+    def test_removed_children_not_followed(self) -> None:
+        self.a_child.delete()
+        result = SoftDeletable.available_objects.filter(name='a').delete(cascade=True)  # type: ignore[misc, call-arg]
+        self.assertEqual(result, (1, {
+            SoftDeletable._meta.label: 1,
+            SoftDeletableChild._meta.label: 0,
+            SoftDeletableGrandchild._meta.label: 0,
+        }))
+
+    def test_no_cascade_by_default(self) -> None:
+        SoftDeletable.available_objects.all().delete()
+        self.assertEqual(self._available(), [0, 2, 3])
+
+    def test_instance(self) -> None:
+        self.a.delete(cascade=True)
+        self.assertEqual(self._available(), [1, 1, 1])
+        self.assertTrue(SoftDeletable.all_objects.get(pk=self.a.pk).is_removed)
+
+    def test_self_referential(self) -> None:
+        root = SoftDeletableNode.available_objects.create()
+        child = SoftDeletableNode.available_objects.create(parent=root)  # type: ignore[misc]
+        grandchild = SoftDeletableNode.available_objects.create(parent=child)  # type: ignore[misc]
+        other = SoftDeletableNode.available_objects.create()
+        result = SoftDeletableNode.available_objects.filter(pk=root.pk).delete(cascade=True)  # type: ignore[call-arg]
+        self.assertEqual(result, (3, {SoftDeletableNode._meta.label: 3}))
+        self.assertEqual(list(SoftDeletableNode.available_objects.all()), [other])
+
+        result = SoftDeletableNode.all_objects.filter(pk=root.pk).restore(cascade=True)  # type: ignore[attr-defined]
+        self.assertEqual(result, (3, {SoftDeletableNode._meta.label: 3}))
+        self.assertEqual(
+            set(SoftDeletableNode.available_objects.all()), {root, child, grandchild, other})
+
+    def test_self_referential_cycle(self) -> None:
+        first = SoftDeletableNode.available_objects.create()
+        second = SoftDeletableNode.available_objects.create(parent=first)  # type: ignore[misc]
+        SoftDeletableNode.all_objects.filter(pk=first.pk).update(parent=second)
+        first.delete(cascade=True)
+        self.assertEqual(SoftDeletableNode.available_objects.count(), 0)
+
+
+class PurgeRemovedTests(TestCase):
+    def setUp(self) -> None:
+        for index, name in enumerate('abcdefg'):
+            SoftDeletable.all_objects.create(name=name, is_removed=index % 3 != 0)
+
+    def _names(self) -> list[str]:
+        return sorted(SoftDeletable.all_objects.values_list('name', flat=True))
+
+    def test_purge(self) -> None:
+        result = SoftDeletable.all_objects.purge_removed(batch_size=3)
+        self.assertEqual(result, (4, {SoftDeletable._meta.label: 4}))
+        self.assertEqual(self._names(), ['a', 'd', 'g'])
+
+    def test_batches(self) -> None:
+        progress: list[tuple[int, Any]] = []
+        pks = list(SoftDeletable.all_objects.filter(is_removed=True).values_list('pk', flat=True))
+        SoftDeletable.all_objects.purge_removed(
+            batch_size=3, progress=lambda purged, pk: progress.append((purged, pk)))
+        self.assertEqual(progress, [(3, pks[2]), (4, pks[3])])
+
+    def test_restored_during_batch(self) -> None:
+        atomic = transaction.atomic
+        restored: list[int] = []
+
+        def restore_then_atomic(*args: Any, **kwargs: Any) -> Any:
+            # c is restored after the first batch was selected.
+            if not restored:
+                restored.append(SoftDeletable.all_objects.filter(name='c').update(is_removed=False))
+            return atomic(*args, **kwargs)
+
+        with mock.patch('model_utils.managers.transaction.atomic', restore_then_atomic):
+            result = SoftDeletable.all_objects.purge_removed(
+                batch_size=3, archive_to=SoftDeletableArchive)
+        self.assertEqual(result, (3, {SoftDeletable._meta.label: 3}))
+        self.assertEqual(self._names(), ['a', 'c', 'd', 'g'])
+        self.assertEqual(
+            sorted(SoftDeletableArchive.objects.values_list('name', flat=True)), ['b', 'e', 'f'])
+
+    def test_start_after(self) -> None:
+        pk = SoftDeletable.all_objects.get(name='e').pk
+        SoftDeletable.all_objects.purge_removed(start_after=pk)
+        self.assertEqual(self._names(), ['a', 'b', 'c', 'd', 'e', 'g'])
+
+    def test_archive(self) -> None:
+        SoftDeletable.all_objects.purge_removed(archive_to=SoftDeletableArchive)
+        archived = SoftDeletableArchive.objects.order_by('name')
+        self.assertEqual([obj.name for obj in archived], ['b', 'c', 'e', 'f'])
+        self.assertEqual(archived[0].pk, SoftDeletable.all_objects.get(name='a').pk + 1)
+
+    def test_cascade(self) -> None:
+        parent = SoftDeletable.all_objects.get(name='b')
+        SoftDeletableChild.all_objects.create(parent=parent)
+        result = SoftDeletable.all_objects.purge_removed()
+        self.assertEqual(result, (5, {SoftDeletable._meta.label: 4, SoftDeletableChild._meta.label: 1}))
+
+    def test_older_than(self) -> None:
+        with time_machine.travel(datetime(2020, 1, 1, tzinfo=timezone.utc)):
+            old = SoftDeletableTimeStamped.all_objects.create(is_removed=True)
+        SoftDeletableTimeStamped.all_objects.create(is_removed=True)
+        result = SoftDeletableTimeStamped.all_objects.purge_removed(
+            older_than=timedelta(days=1), date_field='modified')
+        self.assertEqual(result[0], 1)
+        self.assertFalse(SoftDeletableTimeStamped.all_objects.filter(pk=old.pk).exists())
+
+    def test_older_than_removed_at(self) -> None:
+        with time_machine.travel(datetime(2020, 1, 1, tzinfo=timezone.utc)):
+            SoftDeletable.all_objects.get(name='a').delete()
+        result = SoftDeletable.all_objects.purge_removed(older_than=timedelta(days=1))
+        self.assertEqual(result[0], 1)
+        self.assertEqual(self._names(), ['b', 'c', 'd', 'e', 'f', 'g'])
+
+    def test_older_than_without_date_field(self) -> None:
+        with self.assertRaises(ValueError):
+            CustomSoftDelete.all_objects.purge_removed(older_than=timedelta(days=1))
+
+    def test_command(self) -> None:
+        out = StringIO()
+        call_command(
+            'purge_removed', 'tests.SoftDeletable', '--batch-size=3',
+            '--archive-to=tests.SoftDeletableArchive', stdout=out)
+        self.assertEqual(out.getvalue().splitlines()[-1], 'Deleted 4 objects: tests.SoftDeletable: 4.')
+        self.assertIn('Purged 3 objects, up to primary key ', out.getvalue())
+        self.assertEqual(self._names(), ['a', 'd', 'g'])
+        self.assertEqual(SoftDeletableArchive.objects.count(), 4)
+
+    def test_command_not_soft_deletable(self) -> None:
+        with self.assertRaisesMessage(CommandError, 'tests.Post is not a SoftDeletableModel.'):
+            call_command('purge_removed', 'tests.Post')
+
+
+class SoftDeletableRemovedAtTests(TestCase):
+    def test_instance(self) -> None:
+        instance = SoftDeletable.available_objects.create(name='a')  # type: ignore[misc]
+        self.assertIsNone(instance.removed_at)
+        with time_machine.travel(datetime(2020, 1, 1, tzinfo=timezone.utc), tick=False):
+            instance.delete()
+        instance.refresh_from_db()
+        self.assertEqual(instance.removed_at, datetime(2020, 1, 1, tzinfo=timezone.utc))
+
+    def test_queryset_cascade(self) -> None:
+        parent = SoftDeletable.available_objects.create(name='a')  # type: ignore[misc]
+        SoftDeletableChild.available_objects.create(parent=parent)  # type: ignore[misc]
+        with time_machine.travel(datetime(2020, 1, 1, tzinfo=timezone.utc), tick=False):
+            SoftDeletable.available_objects.all().delete(cascade=True)  # type: ignore[call-arg]
+        self.assertEqual(
+            {obj.removed_at for obj in [*SoftDeletable.all_objects.all(), *SoftDeletableChild.all_objects.all()]},
+            {datetime(2020, 1, 1, tzinfo=timezone.utc)},
+        )
+
+    def test_not_recorded(self) -> None:
+        self.assertFalse(any(field.name == 'removed_at' for field in CustomSoftDelete._meta.fields))
+        CustomSoftDelete.available_objects.create()
+        self.assertEqual(CustomSoftDelete.available_objects.all().delete(), (1, {CustomSoftDelete._meta.label: 1}))
+
+    def test_indexes(self) -> None:
+        indexes = {
+            tuple(index.fields): index.condition
+            for index in SoftDeletable._meta.indexes
+        }
+        self.assertEqual(indexes, {
+            ('removed_at',): Q(is_removed=True),
+            ('name',): Q(is_removed=False),
+        })
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(
+                cursor, SoftDeletable._meta.db_table)
+        for index in SoftDeletable._meta.indexes:
+            self.assertIn(index.name, constraints)
+        self.assertEqual(SoftDeletableChild._meta.indexes[0].fields, ['removed_at'])
+
+
+class RestoreTests(TestCase):
+    def setUp(self) -> None:
+        self.parent = SoftDeletable.available_objects.create(name='a')  # type: ignore[misc]
+        self.child = SoftDeletableChild.available_objects.create(parent=self.parent)  # type: ignore[misc]
+        self.removed_child = SoftDeletableChild.available_objects.create(parent=self.parent)  # type: ignore[misc]
+        SoftDeletableGrandchild.available_objects.create(parent=self.child)  # type: ignore[misc]
+        with time_machine.travel(datetime(2020, 1, 1, tzinfo=timezone.utc), tick=False):
+            self.removed_child.delete()
+        with time_machine.travel(datetime(2020, 1, 2, tzinfo=timezone.utc), tick=False):
+            SoftDeletable.available_objects.all().delete(cascade=True)  # type: ignore[call-arg]
+
+    def test_restore(self) -> None:
+        with self.assertNumQueries(1):
+            result = SoftDeletable.all_objects.restore()
+        self.assertEqual(result, (1, {SoftDeletable._meta.label: 1}))
+        parent = SoftDeletable.available_objects.get()
+        self.assertIsNone(parent.removed_at)
+        self.assertEqual(SoftDeletableChild.available_objects.count(), 0)
+
+    def test_restore_cascade(self) -> None:
+        with self.assertNumQueries(3):
+            result = SoftDeletable.all_objects.filter(name='a').restore(cascade=True)  # type: ignore[attr-defined]
+        self.assertEqual(result, (3, {
+            SoftDeletable._meta.label: 1,
+            SoftDeletableChild._meta.label: 1,
+            SoftDeletableGrandchild._meta.label: 1,
+        }))
+        self.assertEqual(
+            list(SoftDeletableChild.available_objects.values_list('pk', flat=True)),
+            [self.child.pk],
+        )
+        self.assertEqual(SoftDeletableGrandchild.available_objects.count(), 1)
+
+    def test_restore_available_objects(self) -> None:
+        # the objects marked as removed are filtered out
+        result = SoftDeletable.available_objects.all().restore()  # type: ignore[attr-defined]
+        self.assertEqual(result, (0, {SoftDeletable._meta.label: 0}))
+
+    def test_restore_cascade_without_removed_at(self) -> None:
+        with self.assertRaises(ValueError):
+            CustomSoftDelete.all_objects.restore(cascade=True)
+        CustomSoftDelete.all_objects.create(is_removed=True)
+        self.assertEqual(CustomSoftDelete.all_objects.restore(), (1, {CustomSoftDelete._meta.label: 1}))
@@ -151,3 +151,31 @@ class TimeStampedModelTests(TestCase):
             t1.save(update_fields=['test_field', 'status'])
 
         self.assertEqual(t1.modified, datetime(2020, 1, 2, tzinfo=timezone.utc))
+
+
+class TimeStampedModelChangedSinceTests(TestCase):
+    def test_changed_since(self) -> None:
+        start = datetime(2016, 1, 1, 0, 0, 0, 123456, tzinfo=timezone.utc)
+        with time_machine.travel(start, tick=False):
+            t1 = TimeStamp.objects.create()
+            t2 = TimeStamp.objects.create()
+        with time_machine.travel(start + timedelta(seconds=1), tick=False):
+            t3 = TimeStamp.objects.create()
+
+        changed, cursor = TimeStamp.changed_since(limit=2)
+        self.assertEqual(changed, [t1, t2])
+        changed, cursor = TimeStamp.changed_since(cursor)
+        self.assertEqual(changed, [t3])
+
+        # nothing changed since, the cursor is kept
+        changed, next_cursor = TimeStamp.changed_since(cursor)
+        self.assertEqual(changed, [])
+        self.assertEqual(next_cursor, cursor)
+
+        with time_machine.travel(start + timedelta(seconds=2), tick=False):
+            t1.save()
+        changed, cursor = TimeStamp.changed_since(cursor)
+        self.assertEqual(changed, [t1])
+
+    def test_changed_since_empty(self) -> None:
+        self.assertEqual(TimeStamp.changed_since(), ([], None))
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+from typing import Any
+
+from django.test import SimpleTestCase, TestCase
+
+from model_utils import testing
+from model_utils.testing import (
+    InheritanceQueryRecorder,
+    _count_joins,
+    _count_selected_columns,
+    assert_inheritance_query_budget,
+)
+from tests.models import (
+    InheritanceManagerTestChild1,
+    InheritanceManagerTestParent,
+)
+
+# Make the fixtures available to the tests of this module.
+inheritance_queries = testing.inheritance_queries
+inheritance_query_budget = testing.inheritance_query_budget
+
+
+class QueryShapeTests(SimpleTestCase):
+    def test_count_joins(self) -> None:
+        self.assertEqual(_count_joins('SELECT a FROM t'), 0)
+        self.assertEqual(_count_joins(
+            'SELECT a FROM t LEFT OUTER JOIN u ON (t.id = u.id) INNER JOIN v ON (u.id = v.id)'), 2)
+        self.assertEqual(_count_joins('SELECT \'JOIN\', "join" FROM t'), 0)
+
+    def test_count_selected_columns(self) -> None:
+        self.assertEqual(_count_selected_columns('SELECT a FROM t'), 1)
+        self.assertEqual(_count_selected_columns(
+            'SELECT t.a, COALESCE(t.b, 1), (SELECT MAX(c), 1 FROM u) AS m, \'x, y\' FROM t'), 4)
+        self.assertEqual(_count_selected_columns(
+            '(SELECT a, b FROM t) UNION ALL (SELECT a, b FROM u)'), 2)
+        self.assertEqual(_count_selected_columns('UPDATE t SET a = 1, b = 2'), 0)
+
+
+class InheritanceQueryBudgetTests(TestCase):
+    def setUp(self) -> None:
+        InheritanceManagerTestChild1.objects.create()
+
+    def test_recorder(self) -> None:
+        with InheritanceQueryRecorder() as recorder:
+            list(InheritanceManagerTestParent.objects.select_subclasses(
+                InheritanceManagerTestChild1))
+        self.assertEqual(recorder.num_queries, 1)
+        self.assertEqual(recorder.joins, [1])
+        self.assertEqual(recorder.max_joins, 1)
+        self.assertGreater(recorder.max_columns, len(InheritanceManagerTestParent._meta.fields))
+
+    def test_within_budget(self) -> None:
+        with assert_inheritance_query_budget(max_queries=1, max_joins=1):
+            list(InheritanceManagerTestParent.objects.select_subclasses(
+                InheritanceManagerTestChild1))
+
+    def test_budget_exceeded(self) -> None:
+        with self.assertRaisesMessage(AssertionError, 'Query budget exceeded (joins '):
+            with assert_inheritance_query_budget(max_queries=1, max_joins=1):
+                list(InheritanceManagerTestParent.objects.select_subclasses())
+
+    def test_errors_in_block_propagate(self) -> None:
+        with self.assertRaises(ZeroDivisionError):
+            with assert_inheritance_query_budget(max_queries=0):
+                list(InheritanceManagerTestParent.objects.all())
+                1 / 0
+
+
+def test_inheritance_queries_fixture(inheritance_queries: InheritanceQueryRecorder) -> None:
+    list(InheritanceManagerTestParent.objects.select_subclasses())
+    assert inheritance_queries.num_queries == 1
+    assert inheritance_queries.max_joins > 1
+
+
+def test_inheritance_query_budget_fixture(inheritance_query_budget: Any) -> None:
+    with inheritance_query_budget(max_queries=1, max_columns=100):
+        InheritanceManagerTestParent.objects.exists()